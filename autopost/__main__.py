@@ -5,12 +5,19 @@ Main entry point for the bot application
 """
 
 import sys
-import argparse
 from .core.bot import AutomatedPosterBot
 
+# Flags handled without building an argparse parser
+CLI_FLAGS = ("--test", "--post", "--status", "--daemon")
+
+
+def _parse_args(argv):
+    """Parse CLI flags, only falling back to argparse for help or bad input"""
+    if all(arg in CLI_FLAGS for arg in argv):
+        return set(argv)
+
+    import argparse
 
-def main():
-    """Main entry point for the Automated Poster Bot"""
     parser = argparse.ArgumentParser(description="Automated Daily Poster Bot")
     parser.add_argument("--test", action="store_true", help="Make a test post and exit")
     parser.add_argument(
@@ -21,13 +28,19 @@ def main():
     )
     parser.add_argument("--daemon", action="store_true", help="Run in daemon mode")
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    return {f"--{name}" for name, enabled in vars(args).items() if enabled}
+
+
+def main():
+    """Main entry point for the Automated Poster Bot"""
+    flags = _parse_args(sys.argv[1:])
 
     # Create bot instance
     bot = AutomatedPosterBot()
 
     try:
-        if args.test:
+        if "--test" in flags:
             print("Making test post...")
             if bot.initialize():
                 success = bot.make_test_post()
@@ -40,7 +53,7 @@ def main():
                 print("❌ Bot initialization failed!")
                 sys.exit(1)
 
-        elif args.post:
+        elif "--post" in flags:
             print("Making real post on the spot...")
             if bot.initialize():
                 success = bot.make_post("RANDOM")
@@ -53,7 +66,7 @@ def main():
                 print("❌ Bot initialization failed!")
                 sys.exit(1)
 
-        elif args.status:
+        elif "--status" in flags:
             if bot.initialize():
                 status = bot.get_status()
                 print("\n🤖 Bot Status:")
@@ -71,7 +84,7 @@ def main():
             print("🚀 Starting Automated Daily Poster Bot...")
             print("📋 Features:")
             print("  • Daily scheduled post at 12:00 PM")
-            print("  • 5 random posts throughout the day")
+            print("  • 6 random posts throughout the day")
             print("  • Multiple content sources from random APIs")
             print("  • API key authentication (RecentHPost)")
             print("  • MySQL logging")
@@ -5,14 +5,37 @@ This module handles all API interactions including authentication,
 content posting, and connection testing.
 """
 
+import atexit
 import requests
 import logging
 import time
-from typing import Optional, Dict, List
-from requests.exceptions import RequestException
+import threading
+import uuid
+import weakref
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional, Dict, List, Tuple
+from urllib.parse import urlencode
+from requests.adapters import HTTPAdapter
+from requests.exceptions import RequestException, RetryError
+from urllib3.util.retry import Retry
 
 from ..config.settings import Config
 
+# Maximum number of response body bytes/characters written to the log
+MAX_LOGGED_BODY = 4096
+
+# Clients whose sessions are closed at exit; weak, so registering a client
+# doesn't keep it alive
+_clients: "weakref.WeakSet[APIClient]" = weakref.WeakSet()
+
+
+@atexit.register
+def _close_sessions():
+    """Close the HTTP sessions of every live client"""
+    for client in list(_clients):
+        client.session.close()
+        client._probe_session.close()
+
 
 class APIClient:
     """Handles authentication and posting to the RecentHPost API"""
@@ -21,14 +44,79 @@ class APIClient:
         self.logger = logging.getLogger(__name__)
         self.session = requests.Session()
 
-        # Set default headers
-        self.session.headers.update(
-            {"User-Agent": "AutomatedPosterBot/1.0", "x-api-key": Config.API.KEY}
+        # Bounded retries with exponential backoff (0s, 2s, 4s), only for
+        # failures where the post was not accepted: connection errors and
+        # 429/503. A read timeout or a 500/502/504 may come after the server
+        # published the post, so retrying those could post it twice.
+        retry = Retry(
+            total=3,
+            read=0,
+            backoff_factor=1.0,
+            status_forcelist=(429, 503),
+            allowed_methods=frozenset({"POST"}),
+            respect_retry_after_header=True,
+        )
+
+        # Keep-alive pool for posts
+        self._adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=50,
+            pool_block=False,
+            max_retries=retry,
         )
+        self.session.mount("https://", self._adapter)
+        self.session.mount("http://", self._adapter)
+
+        # Connection probes get their own session without retries, so a
+        # failed check costs a single timeout per request
+        self._probe_session = requests.Session()
+        probe_adapter = HTTPAdapter(pool_maxsize=8, max_retries=0)
+        self._probe_session.mount("https://", probe_adapter)
+        self._probe_session.mount("http://", probe_adapter)
+        _clients.add(self)
+
+        # Set default headers (session headers are not mutated after this)
+        for session in (self.session, self._probe_session):
+            session.headers.update(
+                {"User-Agent": "AutomatedPosterBot/1.0", "x-api-key": Config.API.KEY}
+            )
+        self._post_headers = {"Content-Type": "application/x-www-form-urlencoded"}
         
         # Check if we're in test mode (using example.com endpoint)
         self.mock_mode = Config.API.ENDPOINT == "http://example.com/posts" or Config.API.KEY == "test_key"
 
+        # Time of the last successful connection test (monotonic seconds);
+        # None until one succeeds, since the monotonic clock starts at boot
+        self._last_ok_at: Optional[float] = None
+        self._conn_ttl = 30.0
+
+        # Circuit breaker: open after consecutive post failures, then let a
+        # single half-open probe through once the cooldown has passed
+        self._cb_lock = threading.Lock()
+        self._cb_fail_count = 0
+        self._cb_opened_at = 0.0
+        self._cb_half_open = False
+        self._cb_threshold = 5
+        self._cb_cooldown = 60.0
+
+        # Static form fields shared by every post
+        self._base_form = (
+            ("category_id", str(Config.API.CATEGORY_ID)),
+            ("state", Config.API.STATE),
+            ("device", Config.API.DEVICE),
+            ("city", Config.API.CITY),
+            ("user_id", str(Config.API.USER_ID)),
+        ) + tuple(("countries_iso[]", c) for c in Config.API.COUNTRIES_ISO)
+
+        # Ping endpoints derived from the base URL (endpoint without '/posts')
+        self._base_url = Config.API.ENDPOINT.rsplit("/", 1)[0]
+        self._ping_urls = (
+            f"{self._base_url}/ping",
+            f"{self._base_url}/health",
+            f"{self._base_url}/status",
+            self._base_url,
+        )
+
     def post_content(
         self,
         content: str,
@@ -36,7 +124,7 @@ class APIClient:
         hashtags: List[str] = None,
         media_urls: List[str] = None,
     ) -> Dict:
-        """Post content to the RecentHPost API using multipart/form-data"""
+        """Post content to the RecentHPost API as a url-encoded form"""
         try:
             self.logger.info("Posting content to RecentHPost API...")
 
@@ -49,44 +137,28 @@ class APIClient:
                     "status_code": 200,
                 }
 
-            # Prepare form data
-            form_data = {
-                "title": title or "",
-                "category_id": str(Config.API.CATEGORY_ID),
-                "state": Config.API.STATE,
-                "device": Config.API.DEVICE,
-                "city": Config.API.CITY,
-                "user_id": str(Config.API.USER_ID),
-                "content": content,
-            }
-
-            # Add countries_iso array
-            for country in Config.API.COUNTRIES_ISO:
-                form_data[f"countries_iso[]"] = country
-
-            # Add hashtags array (can be empty)
-            if hashtags:
-                for hashtag in hashtags:
-                    form_data[f"hashtags[]"] = hashtag
-            else:
-                # Add empty hashtag if none provided
-                form_data[f"hashtags[]"] = ""
+            # Fail fast while the circuit breaker is open
+            if not self._circuit_allows():
+                self.logger.warning("Circuit breaker open: skipping post")
+                return {"success": False, "error": "circuit_open", "status_code": None}
 
-            # Add media files URLs array (can be empty)
-            if media_urls:
-                for url in media_urls:
-                    form_data[f"media_files_urls[]"] = url
+            # Prepare form data
+            form_data = self._build_form_data(content, title, hashtags, media_urls)
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Post form data: %s", form_data)
 
-            # Make the POST request with multipart/form-data
+            # Make the POST request; text-only posts need no multipart boundaries
             response = self.session.post(
                 Config.API.ENDPOINT,
-                data=form_data,  # This creates multipart/form-data
+                data=urlencode(form_data),
+                headers={**self._post_headers, "Idempotency-Key": str(uuid.uuid4())},
                 timeout=15,  # Reduced timeout from 30 to 15 seconds
             )
 
             response.raise_for_status()
 
             result = response.json() if response.content else {}
+            self._record_post_result(True)
             self.logger.info("Content posted successfully")
 
             return {
@@ -95,10 +167,18 @@ class APIClient:
                 "status_code": response.status_code,
             }
 
+        except RetryError as e:
+            self._record_post_result(False)
+            self.logger.error("Post request failed after retries: %s", e)
+            return {"success": False, "error": str(e), "status_code": None}
         except RequestException as e:
-            self.logger.error(f"Post request failed: {e}")
-            if hasattr(e, "response") and e.response is not None:
-                self.logger.error(f"Response content: {e.response.content}")
+            self._record_post_result(False)
+            self.logger.error("Post request failed: %s", e)
+            if getattr(e, "response", None) is not None:
+                # Cap the logged body so huge error pages don't flood the log
+                self.logger.error(
+                    "Response content: %s", e.response.content[:MAX_LOGGED_BODY]
+                )
             return {
                 "success": False,
                 "error": str(e),
@@ -109,10 +189,81 @@ class APIClient:
                 ),
             }
         except Exception as e:
-            self.logger.error(f"Unexpected error posting content: {e}")
+            self._record_post_result(False)
+            self.logger.error("Unexpected error posting content: %s", e)
             return {"success": False, "error": str(e), "status_code": None}
 
-    def test_connection(self) -> bool:
+    def _circuit_allows(self) -> bool:
+        """Check whether the circuit breaker lets a post through"""
+        with self._cb_lock:
+            if not self._cb_opened_at:
+                return True
+            if time.monotonic() - self._cb_opened_at < self._cb_cooldown:
+                return False
+            if self._cb_half_open:
+                return False  # A probe is already in flight
+            self._cb_half_open = True
+            return True
+
+    def _record_post_result(self, success: bool):
+        """Update the circuit breaker with the outcome of a post"""
+        with self._cb_lock:
+            self._cb_half_open = False
+            if success:
+                self._cb_fail_count = 0
+                self._cb_opened_at = 0.0
+                return
+
+            self._cb_fail_count += 1
+            if self._cb_fail_count >= self._cb_threshold:
+                if not self._cb_opened_at:
+                    self.logger.warning(
+                        "Circuit breaker opened after %d failures", self._cb_fail_count
+                    )
+                self._cb_opened_at = time.monotonic()
+
+    def _build_form_data(
+        self,
+        content: str,
+        title: str = None,
+        hashtags: List[str] = None,
+        media_urls: List[str] = None,
+    ) -> List[Tuple[str, str]]:
+        """Build the post form fields as (key, value) pairs so array fields repeat"""
+        form_data = [("title", title or ""), ("content", content)]
+        form_data.extend(self._base_form)
+
+        # Add hashtags array (send an empty hashtag if none provided)
+        if hashtags:
+            form_data.extend(("hashtags[]", h) for h in hashtags)
+        else:
+            form_data.append(("hashtags[]", ""))
+
+        # Add media files URLs array (can be empty)
+        if media_urls:
+            form_data.extend(("media_files_urls[]", u) for u in media_urls)
+
+        return form_data
+
+    def test_connection(self, force: bool = False) -> bool:
+        """Test the API connection, reusing a recent successful result
+
+        Pass force=True to always probe (e.g. at startup).
+        """
+        now = time.monotonic()
+        if (
+            not force
+            and self._last_ok_at is not None
+            and now - self._last_ok_at < self._conn_ttl
+        ):
+            return True
+
+        connected = self._check_connection()
+        if connected:
+            self._last_ok_at = now
+        return connected
+
+    def _check_connection(self) -> bool:
         """Test the API connection and authentication using a simple ping"""
         try:
             self.logger.info("Testing RecentHPost API connection...")
@@ -122,34 +273,9 @@ class APIClient:
                 self.logger.info("Mock mode: API connection test successful")
                 return True
 
-            # Try a simple GET request to test connectivity
-            # First, try to ping the base URL
-            base_url = Config.API.ENDPOINT.rsplit("/", 1)[
-                0
-            ]  # Remove '/posts' from endpoint
-
-            # Try different ping endpoints
-            ping_endpoints = [
-                f"{base_url}/ping",
-                f"{base_url}/health",
-                f"{base_url}/status",
-                base_url,
-            ]
-
-            for endpoint in ping_endpoints:
-                try:
-                    self.logger.info(f"Trying endpoint: {endpoint}")
-                    response = self.session.get(endpoint, timeout=5)  # Reduced timeout
-                    if response.status_code in [
-                        200,
-                        401,
-                        403,
-                    ]:  # 401/403 means endpoint exists but auth needed
-                        self.logger.info(f"API endpoint reachable: {endpoint}")
-                        return True
-                except RequestException as e:
-                    self.logger.warning(f"Failed to reach {endpoint}: {e}")
-                    continue
+            # Probe all ping endpoints concurrently; first reachable one wins
+            if self._probe_ping_endpoints():
+                return True
 
             # If ping endpoints don't work, try a minimal POST request
             try:
@@ -166,7 +292,7 @@ class APIClient:
                     "hashtags[]": "",
                 }
 
-                response = self.session.post(
+                response = self._probe_session.post(
                     Config.API.ENDPOINT, data=test_data, timeout=10
                 )
 
@@ -178,22 +304,67 @@ class APIClient:
                     self.logger.info("API connection test successful")
                     return True
                 else:
-                    self.logger.warning(f"Unexpected status code: {response.status_code}")
+                    self.logger.warning("Unexpected status code: %s", response.status_code)
 
             except RequestException as e:
-                self.logger.error(f"API connection test failed: {e}")
-                if hasattr(e, 'response') and e.response is not None:
-                    self.logger.error(f"Response status: {e.response.status_code}")
-                    self.logger.error(f"Response content: {e.response.text}")
+                self.logger.error("API connection test failed: %s", e)
+                if getattr(e, "response", None) is not None:
+                    self.logger.error("Response status: %s", e.response.status_code)
+                    self.logger.error(
+                        "Response content: %s", e.response.text[:MAX_LOGGED_BODY]
+                    )
 
             self.logger.error("All API connection tests failed")
-            self.logger.error(f"API endpoint: {Config.API.ENDPOINT}")
+            self.logger.error("API endpoint: %s", Config.API.ENDPOINT)
             self.logger.error("Please check if the API server is running and accessible")
             return False
 
         except Exception as e:
-            self.logger.error(f"Unexpected error testing API connection: {e}")
+            self.logger.error("Unexpected error testing API connection: %s", e)
+            return False
+
+    def _ping(self, endpoint: str) -> int:
+        """Return the status code of an endpoint without downloading its body"""
+        response = self._probe_session.head(
+            endpoint, timeout=5, allow_redirects=True
+        )
+        if response.status_code != 405:
+            return response.status_code
+
+        # HEAD not allowed; fall back to a streamed GET and drop the body
+        response = self._probe_session.get(endpoint, timeout=5, stream=True)
+        try:
+            return response.status_code
+        finally:
+            response.close()
+
+    def _probe_ping_endpoints(self) -> bool:
+        """Probe the ping endpoints in parallel and return on the first hit"""
+        executor = ThreadPoolExecutor(max_workers=len(self._ping_urls))
+        try:
+            futures = {
+                executor.submit(self._ping, endpoint): endpoint
+                for endpoint in self._ping_urls
+            }
+            for future in as_completed(futures):
+                endpoint = futures[future]
+                try:
+                    status_code = future.result()
+                except RequestException as e:
+                    self.logger.warning("Failed to reach %s: %s", endpoint, e)
+                    continue
+
+                # 401/403 means endpoint exists but auth needed
+                if status_code in (200, 401, 403):
+                    self.logger.info("API endpoint reachable: %s", endpoint)
+                    for other in futures:
+                        other.cancel()
+                    return True
+
             return False
+        finally:
+            # Don't wait for slower probes once we have an answer
+            executor.shutdown(wait=False)
 
     def get_api_info(self) -> Dict:
         """Get API information and status"""
@@ -220,5 +391,5 @@ class APIClient:
             return info
 
         except Exception as e:
-            self.logger.error(f"Failed to get API info: {e}")
+            self.logger.error("Failed to get API info: %s", e)
             return {"error": str(e), "connection_status": "unknown"}
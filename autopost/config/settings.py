@@ -7,109 +7,213 @@ API, and bot configuration with environment variable support.
 
 import os
 import sys
-from typing import List, Dict, Any
+from collections import namedtuple
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 from pathlib import Path
 
-try:
-    from dotenv import load_dotenv
-except ImportError:
+from ..content.cleaners import append_punchline, keep_content
 
-    def load_dotenv():
-        pass  # Fallback if dotenv is not available
+
+def _load_env_file():
+    """Load the .env file (if any) without importing dotenv when there is none"""
+    if os.environ.get("AUTOPOST_SKIP_DOTENV") == "1":
+        return
+
+    # Check if running in daemon mode and load .env.production
+    env_name = ".env.production" if "--daemon" in sys.argv else ".env"
+
+    # Child processes inherit the parent's environment, so a file the parent
+    # already loaded doesn't need to be parsed again
+    if os.environ.get("_AUTOPOST_ENV_LOADED") == env_name:
+        return
+
+    dotenv_path = Path(env_name)
+    if not dotenv_path.is_file():
+        dotenv_path = Path(__file__).parent.parent.parent / env_name
+        if not dotenv_path.is_file():
+            return
+
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        return  # Fallback if dotenv is not available
+
+    load_dotenv(dotenv_path)
+    # Only marked once the file was actually read, so a missing file or
+    # python-dotenv doesn't stop a child process from trying again
+    os.environ["_AUTOPOST_ENV_LOADED"] = env_name
 
 
 # Load environment variables
-# Check if running in daemon mode and load .env.production
-if "--daemon" in sys.argv:
-    load_dotenv(".env.production")
-else:
-    load_dotenv()
+_load_env_file()
+
+
+class _EnvSetting:
+    """Setting read from the environment on first access instead of at import
+
+    The first read replaces the descriptor with the parsed value, so later
+    reads are plain class attribute lookups.
+    """
+
+    def __init__(self, env_name: str, default: Any, parse: Callable[[str], Any] = str):
+        self.env_name = env_name
+        self.default = default
+        self.parse = parse
+
+    def __set_name__(self, owner: type, name: str):
+        self.name = name
+
+    def __get__(self, instance: Any, owner: type) -> Any:
+        value = self.parse(os.getenv(self.env_name, self.default))
+        setattr(owner, self.name, value)
+        return value
+
+
+def _split_countries(value: str) -> Tuple[str, ...]:
+    """Parse a comma-separated COUNTRIES_ISO value"""
+    return tuple(value.split(","))
 
 
 class DatabaseConfig:
     """Database configuration settings"""
 
-    HOST = os.getenv("DB_HOST", "127.0.0.1")
-    PORT = int(os.getenv("DB_PORT", 3306))
-    NAME = os.getenv("DB_NAME", "autopost_db")
-    USER = os.getenv("DB_USER", "root1")
-    PASSWORD = os.getenv("DB_PASSWORD", "")
+    HOST = _EnvSetting("DB_HOST", "127.0.0.1")
+    PORT = _EnvSetting("DB_PORT", 3306, int)
+    NAME = _EnvSetting("DB_NAME", "autopost_db")
+    USER = _EnvSetting("DB_USER", "root1")
+    PASSWORD = _EnvSetting("DB_PASSWORD", "")
+    POOL_SIZE = _EnvSetting("DB_POOL_SIZE", 8, int)
+    # Connect over this local socket instead of TCP (DB_HOST/DB_PORT) when set
+    UNIX_SOCKET = _EnvSetting("DB_UNIX_SOCKET", "")
 
 
 class APIConfig:
     """API configuration settings for RecentHPost API"""
 
-    ENDPOINT = os.getenv("API_ENDPOINT", "http://example.com/posts")
-    KEY = os.getenv("API_KEY", "****************")
+    ENDPOINT = _EnvSetting("API_ENDPOINT", "http://example.com/posts")
+    KEY = _EnvSetting("API_KEY", "****************")
 
     # Post configuration
-    USER_ID = int(os.getenv("USER_ID", "1"))
-    CATEGORY_ID = int(os.getenv("CATEGORY_ID", "1"))
-    STATE = os.getenv("STATE", "California")
-    CITY = os.getenv("CITY", "San Francisco")
-    DEVICE = os.getenv("DEVICE", "Python Bot 1.0")
-    COUNTRIES_ISO = os.getenv("COUNTRIES_ISO", "US").split(
-        ","
-    )  # Can be multiple countries
+    USER_ID = _EnvSetting("USER_ID", "1", int)
+    CATEGORY_ID = _EnvSetting("CATEGORY_ID", "1", int)
+    STATE = _EnvSetting("STATE", "California")
+    CITY = _EnvSetting("CITY", "San Francisco")
+    DEVICE = _EnvSetting("DEVICE", "Python Bot 1.0")
+    # Can be multiple countries
+    COUNTRIES_ISO = _EnvSetting("COUNTRIES_ISO", "US", _split_countries)
 
 
 class BotConfig:
     """Bot configuration settings"""
 
-    TIMEZONE = os.getenv("TIMEZONE", "UTC")
-    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
-    LOG_FILE = os.getenv("LOG_FILE", "autopost_bot.log")
+    TIMEZONE = _EnvSetting("TIMEZONE", "UTC")
+    LOG_LEVEL = _EnvSetting("LOG_LEVEL", "INFO")
+    LOG_FILE = _EnvSetting("LOG_FILE", "autopost_bot.log")
+    # Threads running due scheduler jobs (at most DB_POOL_SIZE are used)
+    SCHEDULER_WORKERS = _EnvSetting("SCHEDULER_WORKERS", 2, int)
+
+
+# Content source with its JSON key paths split once at import
+# (e.g. "slip.advice" -> ("slip", "advice"), "facts.0" -> ("facts", 0)) and
+# its cleaner, called as cleaner(content, data, source)
+ContentSource = namedtuple(
+    "ContentSource", "name url path title_path punchline_path cleaner"
+)
+
+_RAW_CONTENT_SOURCES = [
+    {
+        "name": "Quotes API",
+        "url": "https://api.quotable.io/random",
+        "content_key": "content",
+        "author_key": "author",
+        "title_key": None,  # No title available
+    },
+    {
+        "name": "Joke API",
+        "url": "https://official-joke-api.appspot.com/random_joke",
+        "content_key": "setup",
+        "punchline_key": "punchline",
+        "cleaner": append_punchline,
+        "title_key": None,  # No title available
+    },
+    {
+        "name": "Advice API",
+        "url": "https://api.adviceslip.com/advice",
+        "content_key": "slip.advice",
+        "title_key": None,  # No title available
+    },
+    {
+        "name": "Useless Facts API",
+        "url": "https://uselessfacts.jsph.pl/api/v2/facts/random",
+        "content_key": "text",
+        "title_key": None,  # No title available
+    },
+    {
+        "name": "Dog Facts API",
+        "url": "https://dog-api.kinduff.com/api/facts",
+        "content_key": "facts.0",
+        "title_key": None,  # No title available
+    },
+    {
+        "name": "Random Word API",
+        "url": "https://random-word-api.herokuapp.com/word",
+        "content_key": "0",
+        "title_key": None,  # No title available
+    },
+    {
+        "name": "Bored API",
+        "url": "https://www.boredapi.com/api/activity",
+        "content_key": "activity",
+        "title_key": "type",
+    },
+]
+
+
+def _split_key(key: Optional[str]) -> Optional[Tuple[Union[str, int], ...]]:
+    """Split a dotted JSON key into path components, turning indexes into ints"""
+    if not key:
+        return None
+    return tuple(int(p) if p.isdigit() else p for p in key.split("."))
 
 
 class ContentAPIConfig:
     """Content API sources configuration"""
 
-    SOURCES = [
-        {
-            "name": "Quotes API",
-            "url": "https://api.quotable.io/random",
-            "content_key": "content",
-            "author_key": "author",
-            "title_key": None,  # No title available
-        },
-        {
-            "name": "Joke API",
-            "url": "https://official-joke-api.appspot.com/random_joke",
-            "content_key": "setup",
-            "punchline_key": "punchline",
-            "title_key": None,  # No title available
-        },
-        {
-            "name": "Advice API",
-            "url": "https://api.adviceslip.com/advice",
-            "content_key": "slip.advice",
-            "title_key": None,  # No title available
-        },
-        {
-            "name": "Useless Facts API",
-            "url": "https://uselessfacts.jsph.pl/api/v2/facts/random",
-            "content_key": "text",
-            "title_key": None,  # No title available
-        },
-        {
-            "name": "Dog Facts API",
-            "url": "https://dog-api.kinduff.com/api/facts",
-            "content_key": "facts.0",
-            "title_key": None,  # No title available
-        },
-        {
-            "name": "Random Word API",
-            "url": "https://random-word-api.herokuapp.com/word",
-            "content_key": "0",
-            "title_key": None,  # No title available
-        },
-        {
-            "name": "Bored API",
-            "url": "https://www.boredapi.com/api/activity",
-            "content_key": "activity",
-            "title_key": "type",
-        },
-    ]
+    SOURCES = tuple(
+        ContentSource(
+            name=source["name"],
+            url=source["url"],
+            path=_split_key(source["content_key"]),
+            title_path=_split_key(source.get("title_key")),
+            punchline_path=_split_key(source.get("punchline_key")),
+            cleaner=source.get("cleaner", keep_content),
+        )
+        for source in _RAW_CONTENT_SOURCES
+    )
+
+
+# Fields that must be set for the bot to run
+_REQUIRED_FIELDS = (
+    "API_ENDPOINT",
+    "API_KEY",
+    "USER_ID",
+    "CATEGORY_ID",
+    "DB_HOST",
+    "DB_NAME",
+    "DB_USER",
+    "DB_PASSWORD",
+)
+
+
+class _Alias:
+    """Backward compatibility name (e.g. Config.API_KEY) for a section setting"""
+
+    def __init__(self, section: type, attr: str):
+        self.section = section
+        self.attr = attr
+
+    def __get__(self, instance: Any, owner: type) -> Any:
+        return getattr(self.section, self.attr)
 
 
 class Config:
@@ -121,53 +225,45 @@ class Config:
     Bot = BotConfig
     ContentAPI = ContentAPIConfig
 
-    # Backward compatibility aliases
-    DB_HOST = DatabaseConfig.HOST
-    DB_PORT = DatabaseConfig.PORT
-    DB_NAME = DatabaseConfig.NAME
-    DB_USER = DatabaseConfig.USER
-    DB_PASSWORD = DatabaseConfig.PASSWORD
+    # Backward compatibility aliases, read through to the sections on access
+    DB_HOST = _Alias(DatabaseConfig, "HOST")
+    DB_PORT = _Alias(DatabaseConfig, "PORT")
+    DB_NAME = _Alias(DatabaseConfig, "NAME")
+    DB_USER = _Alias(DatabaseConfig, "USER")
+    DB_PASSWORD = _Alias(DatabaseConfig, "PASSWORD")
+
+    API_ENDPOINT = _Alias(APIConfig, "ENDPOINT")
+    API_KEY = _Alias(APIConfig, "KEY")
+    USER_ID = _Alias(APIConfig, "USER_ID")
+    CATEGORY_ID = _Alias(APIConfig, "CATEGORY_ID")
+    STATE = _Alias(APIConfig, "STATE")
+    CITY = _Alias(APIConfig, "CITY")
+    DEVICE = _Alias(APIConfig, "DEVICE")
+    COUNTRIES_ISO = _Alias(APIConfig, "COUNTRIES_ISO")
 
-    API_ENDPOINT = APIConfig.ENDPOINT
-    API_KEY = APIConfig.KEY
-    USER_ID = APIConfig.USER_ID
-    CATEGORY_ID = APIConfig.CATEGORY_ID
-    STATE = APIConfig.STATE
-    CITY = APIConfig.CITY
-    DEVICE = APIConfig.DEVICE
-    COUNTRIES_ISO = APIConfig.COUNTRIES_ISO
+    TIMEZONE = _Alias(BotConfig, "TIMEZONE")
+    LOG_LEVEL = _Alias(BotConfig, "LOG_LEVEL")
 
-    TIMEZONE = BotConfig.TIMEZONE
-    LOG_LEVEL = BotConfig.LOG_LEVEL
+    CONTENT_APIS = _Alias(ContentAPIConfig, "SOURCES")
 
-    CONTENT_APIS = ContentAPIConfig.SOURCES
+    # Set once validation passes; a failure is re-checked on the next call
+    _validated = False
 
     @classmethod
     def validate_config(cls) -> bool:
         """Validate that all required configuration is present"""
-        required_fields = [
-            "API_ENDPOINT",
-            "API_KEY",
-            "USER_ID",
-            "CATEGORY_ID",
-            "DB_HOST",
-            "DB_NAME",
-            "DB_USER",
-            "DB_PASSWORD",
-        ]
-
-        missing_fields = []
-        for field in required_fields:
-            if not getattr(cls, field):
-                missing_fields.append(field)
+        if cls._validated:
+            return True
+
+        missing_fields = tuple(f for f in _REQUIRED_FIELDS if not getattr(cls, f))
 
         if missing_fields:
-            print(
-                f"❌ Missing required configuration fields: {', '.join(missing_fields)}"
-            )
+            missing = ", ".join(missing_fields)
+            print(f"\u274c Missing required configuration fields: {missing}")
             print("Please check your .env file or environment variables.")
             return False
 
+        cls._validated = True
         return True
 
     @classmethod
@@ -179,3 +275,8 @@ class Config:
     def get_log_file_path(cls) -> Path:
         """Get the log file path"""
         return cls.get_project_root() / cls.Bot.LOG_FILE
+
+
+# Strict deployments fail at import on missing settings; dev stays permissive
+if os.environ.get("AUTOPOST_STRICT") == "1" and not Config.validate_config():
+    raise RuntimeError("Invalid configuration (AUTOPOST_STRICT=1)")
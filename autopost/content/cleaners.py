@@ -0,0 +1,38 @@
+"""
+Source-specific content cleaners for the Automated Daily Poster Bot.
+
+Each content source is bound to one of these when the configuration is
+loaded, so fetching never has to look a cleaner up by source name.
+"""
+
+import operator
+from functools import lru_cache, reduce
+from typing import Any, Callable, Optional, Tuple, Union
+
+
+@lru_cache(maxsize=None)
+def _compile_accessor(path: Tuple[Union[str, int], ...]) -> Callable[[Any], Any]:
+    """Build (once per path) a callable that walks a JSON response"""
+    if len(path) == 1:
+        return operator.itemgetter(path[0])
+    return lambda data: reduce(operator.getitem, path, data)
+
+
+def resolve_path(data: Any, path: Tuple[Union[str, int], ...]) -> Optional[str]:
+    """Follow a pre-split key path through a JSON response"""
+    try:
+        value = _compile_accessor(path)(data)
+    except (KeyError, IndexError, TypeError):
+        return None
+    return None if value is None else str(value)
+
+
+def keep_content(content: str, data: Any, api: Any) -> str:
+    """Default cleaner: the extracted content needs no source-specific work"""
+    return content
+
+
+def append_punchline(content: str, data: Any, api: Any) -> str:
+    """For jokes, combine setup and punchline"""
+    punchline = resolve_path(data, api.punchline_path) if api.punchline_path else None
+    return f"{content} {punchline.strip()}" if punchline else content
@@ -5,13 +5,76 @@ This module handles fetching content from various external APIs
 and provides fallback content when APIs are unavailable.
 """
 
+import json
 import requests
 import logging
 import random
-from typing import Dict, List, Optional, Any
+import re
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from requests.adapters import HTTPAdapter
 from requests.exceptions import RequestException
+from urllib3.util.retry import Retry
 
-from ..config.settings import Config
+from ..config.settings import Config, ContentSource
+from .cleaners import resolve_path
+
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads  # Fallback if orjson is not available
+
+
+# (connect, read) timeout for content API requests: a slow TLS handshake
+# fails fast while a slow body still gets time to arrive
+FETCH_TIMEOUT = (2, 8)
+
+# Whitespace runs collapsed to a single space when cleaning content
+_WS_RE = re.compile(r"\s+")
+
+# Anything _WS_RE would change: a whitespace run or a non-space whitespace char
+_MULTI_WS_RE = re.compile(r"\s{2,}|[^\S ]")
+
+# Raw content is capped at this length before cleaning (output is <= 280 chars)
+MAX_RAW_CONTENT = 2048
+
+# Sources requested up front by fetch_content; the rest are only started when
+# one of those fails or none has answered within FETCH_HEDGE_DELAY seconds
+FETCH_HEDGE_WIDTH = 2
+FETCH_HEDGE_DELAY = 2.0
+
+# Shared by every fetch_content call instead of a new pool (and threads) per call
+_fetch_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="content-fetch")
+
+# Fallback messages used when every content API fails
+_FALLBACK_CONTENT = (
+    "Sometimes the best content is the simplest content. Keep it real! 🌟",
+    "Life is what happens while you're busy making other plans. - John Lennon 📝",
+    "The only way to do great work is to love what you do. - Steve Jobs 💼",
+    "Success is not final, failure is not fatal: it is the courage to continue "
+    "that counts. - Winston Churchill 🎯",
+    "The future belongs to those who believe in the beauty of their dreams. "
+    "- Eleanor Roosevelt ✨",
+    "Don't watch the clock; do what it does. Keep going. ⏰",
+    "The only limit to our realization of tomorrow is our doubts of today. "
+    "- Franklin D. Roosevelt 🌅",
+    "It always seems impossible until it's done. - Nelson Mandela 🏆",
+    "The best way to predict the future is to create it. - Peter Drucker 🔮",
+    "Dream big, work hard, stay focused, and surround yourself with good people. 🚀",
+)
+
+
+class FetchResult(NamedTuple):
+    """Content fetched from a source (fixed layout, no per-instance __dict__)"""
+
+    content: str
+    title: Optional[str]
+    api_name: str
+    api_url: Optional[str]
 
 
 class ContentFetcher:
@@ -22,116 +85,154 @@ class ContentFetcher:
         self.session = requests.Session()
         self.session.headers.update({"User-Agent": "AutomatedPosterBot/1.0"})
 
-    def fetch_content(self) -> Dict[str, Any]:
+        # One keep-alive pool per content host, sized for concurrent fetches
+        num_sources = len(Config.ContentAPI.SOURCES)
+        adapter = HTTPAdapter(
+            pool_connections=num_sources,
+            pool_maxsize=2 * num_sources,
+            # Transient overload/5xx answers are retried by urllib3; once the
+            # retries run out the last response is handed back as-is
+            max_retries=Retry(
+                total=2,
+                backoff_factor=0.3,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=frozenset({"GET"}),
+                raise_on_status=False,
+            ),
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        # url -> (etag, last_modified, parsed json) for conditional GETs
+        self._response_cache: Dict[str, Tuple[Optional[str], Optional[str], Any]] = {}
+
+    def fetch_content(self) -> FetchResult:
         """Fetch content from a random API source"""
-        # Shuffle the APIs to get random selection
-        apis = Config.ContentAPI.SOURCES.copy()
-        random.shuffle(apis)
+        # Random order over the (immutable) source tuple
+        sources = Config.ContentAPI.SOURCES
+        apis = random.sample(sources, len(sources))
+
+        # Hedge over the first few sources and take whichever answers first
+        # (the order is already random); start another source whenever one
+        # fails or none has answered within FETCH_HEDGE_DELAY
+        pending = deque(apis)
+        in_flight: Dict[Future, ContentSource] = {}
+
+        def start_next():
+            if pending:
+                api = pending.popleft()
+                in_flight[_fetch_pool.submit(self._fetch_from_api, api)] = api
+
+        for _ in range(FETCH_HEDGE_WIDTH):
+            start_next()
+
+        while in_flight:
+            done, _ = wait(
+                in_flight,
+                timeout=FETCH_HEDGE_DELAY if pending else None,
+                return_when=FIRST_COMPLETED,
+            )
+            if not done:
+                start_next()
+                continue
+
+            for future in done:
+                api = in_flight.pop(future)
+                try:
+                    content_data = future.result()
+                except Exception as e:
+                    self.logger.warning("Failed to fetch from %s: %s", api.name, e)
+                    content_data = None
 
-        for api in apis:
-            try:
-                content_data = self._fetch_from_api(api)
                 if content_data:
+                    for other in in_flight:
+                        other.cancel()
                     return content_data
-            except Exception as e:
-                self.logger.warning(f"Failed to fetch from {api['name']}: {e}")
-                continue
+                start_next()
 
         # If all APIs fail, return fallback content
         self.logger.warning("All content APIs failed, using fallback content")
         return self.get_fallback_content()
 
-    def _fetch_from_api(self, api: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def _fetch_from_api(self, api: ContentSource) -> Optional[FetchResult]:
         """Fetch content from a specific API"""
         try:
-            self.logger.info(f"Fetching content from {api['name']}...")
+            self.logger.info("Fetching content from %s...", api.name)
 
-            response = self.session.get(api["url"], timeout=10)
+            response, data = self._get_json(api.url)
             response.raise_for_status()
 
-            data = response.json()
-
             # Extract content based on API configuration
             content = self._extract_content(data, api)
             title = self._extract_title(data, api)
 
             if not content:
-                raise ValueError(f"No content found in {api['name']} response")
+                raise ValueError(f"No content found in {api.name} response")
 
             # Clean and format content
-            content = self._clean_content(content, api)
+            content = self._clean_content(content, api, data)
 
-            return {
-                "content": content,
-                "title": title,
-                "api_name": api["name"],
-                "api_url": api["url"],
-            }
+            return FetchResult(
+                content=content, title=title, api_name=api.name, api_url=api.url
+            )
 
         except Exception as e:
-            self.logger.error(f"Error fetching from {api['name']}: {e}")
+            self.logger.error("Error fetching from %s: %s", api.name, e)
             return None
 
-    def _extract_content(self, data: Dict, api: Dict[str, Any]) -> Optional[str]:
+    def _get_json(
+        self, url: str, timeout: Tuple[float, float] = FETCH_TIMEOUT
+    ) -> Tuple[requests.Response, Any]:
+        """GET a JSON resource, revalidating any cached copy with ETag/Last-Modified
+
+        Returns the response and the parsed body; on HTTP 304 the body is the
+        previously parsed object. The body is None for other non-200 answers.
+        """
+        cached = self._response_cache.get(url)
+        headers = {}
+        if cached:
+            etag, last_modified, _ = cached
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+        response = self.session.get(url, timeout=timeout, headers=headers)
+
+        if response.status_code == 304 and cached:
+            return response, cached[2]
+        if response.status_code != 200:
+            return response, None
+
+        data = _json_loads(response.content)
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag or last_modified:
+            self._response_cache[url] = (etag, last_modified, data)
+        return response, data
+
+    def _extract_content(self, data: Any, api: ContentSource) -> Optional[str]:
         """Extract content from API response based on configuration"""
-        try:
-            content_key = api["content_key"]
-
-            # Handle nested keys (e.g., 'slip.advice')
-            if "." in content_key:
-                keys = content_key.split(".")
-                value = data
-                for key in keys:
-                    if isinstance(value, dict) and key in value:
-                        value = value[key]
-                    else:
-                        return None
-                return str(value)
-            else:
-                return str(data.get(content_key, ""))
-
-        except Exception as e:
-            self.logger.error(f"Error extracting content from {api['name']}: {e}")
-            return None
+        return resolve_path(data, api.path)
 
-    def _extract_title(self, data: Dict, api: Dict[str, Any]) -> Optional[str]:
+    def _extract_title(self, data: Any, api: ContentSource) -> Optional[str]:
         """Extract title from API response if available"""
-        try:
-            title_key = api.get("title_key")
-            if not title_key:
-                return None
-
-            # Handle nested keys
-            if "." in title_key:
-                keys = title_key.split(".")
-                value = data
-                for key in keys:
-                    if isinstance(value, dict) and key in value:
-                        value = value[key]
-                    else:
-                        return None
-                return str(value)
-            else:
-                return str(data.get(title_key, ""))
-
-        except Exception as e:
-            self.logger.error(f"Error extracting title from {api['name']}: {e}")
+        if not api.title_path:
             return None
+        return resolve_path(data, api.title_path)
 
-    def _clean_content(self, content: str, api: Dict[str, Any]) -> str:
+    def _clean_content(self, content: str, api: ContentSource, data: Any = None) -> str:
         """Clean and format content based on API type"""
-        content = content.strip()
+        # Cap pathological payloads before the per-character work below;
+        # stripping first keeps leading whitespace from using up the cap
+        content = content.strip()[:MAX_RAW_CONTENT].rstrip()
 
-        # Handle special cases for different APIs
-        if api["name"] == "Joke API":
-            # For jokes, combine setup and punchline
-            punchline_key = api.get("punchline_key")
-            if punchline_key and punchline_key in api:
-                # This would need to be handled in the main fetch method
-                pass
+        # Handle special cases for different APIs (bound at config load)
+        content = api.cleaner(content, data, api)
 
-        # Remove excessive whitespace
-        content = " ".join(content.split())
+        # Remove excessive whitespace (most payloads are already single-spaced)
+        if _MULTI_WS_RE.search(content):
+            content = _WS_RE.sub(" ", content)
 
         # Ensure content is not too long (Twitter-like limit)
         if len(content) > 280:
@@ -139,46 +240,34 @@ class ContentFetcher:
 
         return content
 
-    def get_fallback_content(self) -> Dict[str, Any]:
+    def get_fallback_content(self) -> FetchResult:
         """Get fallback content when all APIs fail"""
-        fallback_content = [
-            "Sometimes the best content is the simplest content. Keep it real! 🌟",
-            "Life is what happens while you're busy making other plans. - John Lennon 📝",
-            "The only way to do great work is to love what you do. - Steve Jobs 💼",
-            "Success is not final, failure is not fatal: it is the courage to continue that counts. - Winston Churchill 🎯",
-            "The future belongs to those who believe in the beauty of their dreams. - Eleanor Roosevelt ✨",
-            "Don't watch the clock; do what it does. Keep going. ⏰",
-            "The only limit to our realization of tomorrow is our doubts of today. - Franklin D. Roosevelt 🌅",
-            "It always seems impossible until it's done. - Nelson Mandela 🏆",
-            "The best way to predict the future is to create it. - Peter Drucker 🔮",
-            "Dream big, work hard, stay focused, and surround yourself with good people. 🚀",
-        ]
-
-        content = random.choice(fallback_content)
-
-        return {
-            "content": content,
-            "title": None,
-            "api_name": "Fallback Content",
-            "api_url": None,
-        }
+        return FetchResult(
+            content=random.choice(_FALLBACK_CONTENT),
+            title=None,
+            api_name="Fallback Content",
+            api_url=None,
+        )
 
     def get_available_apis(self) -> List[Dict[str, Any]]:
         """Get list of available content APIs with their status"""
-        available_apis = []
+        sources = Config.ContentAPI.SOURCES
+        with ThreadPoolExecutor(max_workers=min(16, len(sources))) as executor:
+            return list(executor.map(self._probe_api, sources))
 
-        for api in Config.ContentAPI.SOURCES:
-            try:
-                response = self.session.get(api["url"], timeout=5)
-                status = "available" if response.status_code == 200 else "unavailable"
-            except Exception:
-                status = "unavailable"
-
-            available_apis.append(
-                {"name": api["name"], "url": api["url"], "status": status}
+    def _probe_api(self, api: ContentSource) -> Dict[str, Any]:
+        """Check whether a single content API answers"""
+        try:
+            response, _ = self._get_json(api.url)
+            status = (
+                "available"
+                if response.status_code in (200, 304)
+                else "unavailable"
             )
+        except Exception:
+            status = "unavailable"
 
-        return available_apis
+        return {"name": api.name, "url": api.url, "status": status}
 
     def test_api_connection(self, api_name: str = None) -> Dict[str, Any]:
         """Test connection to content APIs"""
@@ -187,24 +276,27 @@ class ContentFetcher:
         if api_name:
             # Test specific API
             api = next(
-                (a for a in Config.ContentAPI.SOURCES if a["name"] == api_name), None
+                (a for a in Config.ContentAPI.SOURCES if a.name == api_name), None
             )
             if api:
                 results[api_name] = self._test_single_api(api)
         else:
-            # Test all APIs
-            for api in Config.ContentAPI.SOURCES:
-                results[api["name"]] = self._test_single_api(api)
+            # Test all APIs in parallel
+            sources = Config.ContentAPI.SOURCES
+            with ThreadPoolExecutor(max_workers=min(16, len(sources))) as executor:
+                for api, result in zip(
+                    sources, executor.map(self._test_single_api, sources)
+                ):
+                    results[api.name] = result
 
         return results
 
-    def _test_single_api(self, api: Dict[str, Any]) -> Dict[str, Any]:
+    def _test_single_api(self, api: ContentSource) -> Dict[str, Any]:
         """Test a single API connection"""
         try:
-            response = self.session.get(api["url"], timeout=10)
+            response, data = self._get_json(api.url)
 
-            if response.status_code == 200:
-                data = response.json()
+            if response.status_code in (200, 304):
                 content = self._extract_content(data, api)
 
                 return {
@@ -225,3 +317,9 @@ class ContentFetcher:
 
         except Exception as e:
             return {"status": "error", "error": str(e)}
+
+
+@lru_cache(maxsize=1)
+def get_shared_fetcher() -> ContentFetcher:
+    """Get the process-wide ContentFetcher so its session pool stays warm"""
+    return ContentFetcher()
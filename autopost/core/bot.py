@@ -6,17 +6,19 @@ posting operations and manages the overall bot lifecycle.
 """
 
 import logging
-import time
+import re
+import signal
 import threading
 import random
 from datetime import datetime
+from itertools import chain
 from typing import Dict, Optional, List
 
 from ..config.settings import Config
 from ..database.manager import DatabaseManager
-from ..content.fetcher import ContentFetcher
+from ..content.fetcher import get_shared_fetcher
 from ..api.client import APIClient
-from ..services.scheduler import PostScheduler
+from ..services.scheduler import PostScheduler, mark_post_counts_stale
 from ..utils.notifier import (
     send_notification,
     send_post_notification,
@@ -24,6 +26,76 @@ from ..utils.notifier import (
 )
 
 
+# API source mapped to its default hashtags
+_API_HASHTAGS = {
+    "Quotes API": ("#quote", "#inspiration", "#motivation"),
+    "Joke API": ("#joke", "#humor", "#funny"),
+    "Advice API": ("#advice", "#wisdom", "#tips"),
+    "Useless Facts API": ("#facts", "#trivia", "#knowledge"),
+    "Dog Facts API": ("#dogs", "#pets", "#animals"),
+    "Random Word API": ("#word", "#vocabulary", "#language"),
+    "Bored API": ("#activity", "#ideas", "#fun"),
+    "Fallback Content": ("#motivation", "#inspiration", "#life"),
+}
+
+_DEFAULT_HASHTAGS = ("#autopost", "#bot")
+
+# Content keywords mapped to the hashtags they add
+_KEYWORD_HASHTAGS = {
+    "success": ("#success", "#goals"),
+    "achieve": ("#success", "#goals"),
+    "goal": ("#success", "#goals"),
+    "love": ("#love", "#relationships"),
+    "heart": ("#love", "#relationships"),
+    "relationship": ("#love", "#relationships"),
+    "work": ("#work", "#career"),
+    "career": ("#work", "#career"),
+    "job": ("#work", "#career"),
+    "health": ("#health", "#fitness"),
+    "fitness": ("#health", "#fitness"),
+    "exercise": ("#health", "#fitness"),
+}
+
+# Plain substring match (no word boundaries), so "goals" or "homework" also hit
+_KEYWORD_RE = re.compile("|".join(_KEYWORD_HASHTAGS), re.IGNORECASE)
+
+# Root logging handlers are installed once per process
+_LOGGING_CONFIGURED = False
+_LOGGING_LOCK = threading.Lock()
+
+
+def _raise_keyboard_interrupt(signum, frame):
+    """SIGTERM handler that unwinds the main thread like Ctrl+C"""
+    raise KeyboardInterrupt
+
+
+def _configure_logging_once():
+    """Attach the file and console handlers to the root logger exactly once"""
+    global _LOGGING_CONFIGURED
+
+    with _LOGGING_LOCK:
+        if _LOGGING_CONFIGURED:
+            return
+        _LOGGING_CONFIGURED = True
+
+        # Like basicConfig, leave logging alone if the host app configured it
+        root = logging.getLogger()
+        if root.handlers:
+            return
+
+        formatter = logging.Formatter(
+            "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+        )
+        # delay=True opens the log file on the first record, not at setup
+        file_handler = logging.FileHandler(Config.get_log_file_path(), delay=True)
+        stream_handler = logging.StreamHandler()
+
+        root.setLevel(getattr(logging, Config.Bot.LOG_LEVEL))
+        for handler in (file_handler, stream_handler):
+            handler.setFormatter(formatter)
+            root.addHandler(handler)
+
+
 class AutomatedPosterBot:
     """Main bot class that orchestrates automated posting"""
 
@@ -33,26 +105,20 @@ class AutomatedPosterBot:
 
         # Initialize components
         self.database_manager = DatabaseManager()
-        self.content_fetcher = ContentFetcher()
+        self.content_fetcher = get_shared_fetcher()
         self.api_client = APIClient()
         self.scheduler = PostScheduler(self.database_manager)
 
         # Bot state
         self.is_running = False
         self.scheduler_thread = None
+        self._stop_event = threading.Event()
 
         self.logger.info("Bot initialization complete")
 
     def _setup_logging(self) -> logging.Logger:
         """Setup logging configuration"""
-        log_file_path = Config.get_log_file_path()
-
-        logging.basicConfig(
-            level=getattr(logging, Config.Bot.LOG_LEVEL),
-            format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-            handlers=[logging.FileHandler(log_file_path), logging.StreamHandler()],
-        )
-
+        _configure_logging_once()
         return logging.getLogger(__name__)
 
     def initialize(self) -> bool:
@@ -76,8 +142,8 @@ class AutomatedPosterBot:
             self.database_manager.create_tables()
             self.logger.info("Database tables verified")
 
-            # Test API connection
-            api_connected = self.api_client.test_connection()
+            # Test API connection (always probe at startup, never a cached result)
+            api_connected = self.api_client.test_connection(force=True)
             if not api_connected:
                 self.logger.warning("Failed to test API connection - bot will run in limited mode")
                 self.logger.warning("Posts will be logged but not sent to external API")
@@ -89,28 +155,28 @@ class AutomatedPosterBot:
             return True
 
         except Exception as e:
-            self.logger.error(f"Initialization failed: {e}")
+            self.logger.error("Initialization failed: %s", e)
             send_error_notification(str(e), "Bot Initialization")
             return False
 
     def make_post(self, post_type: str = "RANDOM") -> bool:
         """Make a single post with content from random API"""
         try:
-            self.logger.info(f"Making {post_type} post...")
+            self.logger.info("Making %s post...", post_type)
 
             # Fetch content from random API
             try:
                 content_data = self.content_fetcher.fetch_content()
-                content = content_data["content"]
-                api_name = content_data["api_name"]
-                title = content_data.get("title")
-                self.logger.info(f"Content fetched from: {api_name}")
+                content = content_data.content
+                api_name = content_data.api_name
+                title = content_data.title
+                self.logger.info("Content fetched from: %s", api_name)
             except Exception as e:
-                self.logger.warning(f"Failed to fetch content from APIs: {e}")
+                self.logger.warning("Failed to fetch content from APIs: %s", e)
                 content_data = self.content_fetcher.get_fallback_content()
-                content = content_data["content"]
-                api_name = content_data["api_name"]
-                title = content_data.get("title")
+                content = content_data.content
+                api_name = content_data.api_name
+                title = content_data.title
                 self.logger.info("Using fallback content")
 
             # Generate hashtags
@@ -122,77 +188,68 @@ class AutomatedPosterBot:
             )
 
             # Log the post attempt
-            post_id = self.database_manager.log_post(
-                post_type=post_type,
-                content=content,
-                title=title,
-                hashtags=hashtags,
-                api_source=api_name,
-                status="success" if result["success"] else "failed",
-                error_message=result.get("error"),
-            )
+            if result["success"]:
+                post_id = self.database_manager.log_success_post(
+                    post_type=post_type,
+                    content=content,
+                    title=title,
+                    hashtags=hashtags,
+                    api_source=api_name,
+                )
+            else:
+                # Nothing needs the ID of a failed attempt, so write it behind:
+                # the scheduler flushes the queue in the background and on stop
+                self.database_manager.queue_post_log(
+                    post_type=post_type,
+                    content=content,
+                    title=title,
+                    hashtags=hashtags,
+                    api_source=api_name,
+                    status="failed",
+                    error_message=result.get("error"),
+                )
 
             # Update bot status
             if result["success"]:
                 self._update_post_counters(post_type)
-                self.logger.info(f"Post successful (ID: {post_id})")
+                if not self.scheduler.is_running:
+                    mark_post_counts_stale()  # Made outside the scheduler
+                self.logger.info("Post successful (ID: %s)", post_id)
 
                 # Send notification
                 send_post_notification(post_type, True, content[:100])
 
                 return True
             else:
-                self.logger.error(f"Post failed: {result.get('error')}")
+                self.logger.error("Post failed: %s", result.get("error"))
                 send_post_notification(post_type, False, content[:100])
                 return False
 
         except Exception as e:
-            self.logger.error(f"Error making post: {e}")
+            self.logger.error("Error making post: %s", e)
             send_error_notification(str(e), f"{post_type} Post Error")
             return False
 
     def _generate_smart_hashtags(self, content: str, api_name: str) -> List[str]:
         """Generate relevant hashtags based on content and API source"""
-        hashtags = []
-
-        # Add API-specific hashtags
-        api_hashtags = {
-            "Quotes API": ["#quote", "#inspiration", "#motivation"],
-            "Joke API": ["#joke", "#humor", "#funny"],
-            "Advice API": ["#advice", "#wisdom", "#tips"],
-            "Useless Facts API": ["#facts", "#trivia", "#knowledge"],
-            "Dog Facts API": ["#dogs", "#pets", "#animals"],
-            "Random Word API": ["#word", "#vocabulary", "#language"],
-            "Bored API": ["#activity", "#ideas", "#fun"],
-            "Fallback Content": ["#motivation", "#inspiration", "#life"],
-        }
-
-        hashtags.extend(api_hashtags.get(api_name, ["#autopost", "#bot"]))
-
-        # Add content-based hashtags
-        content_lower = content.lower()
-
-        if any(word in content_lower for word in ["success", "achieve", "goal"]):
-            hashtags.extend(["#success", "#goals"])
-        if any(word in content_lower for word in ["love", "heart", "relationship"]):
-            hashtags.extend(["#love", "#relationships"])
-        if any(word in content_lower for word in ["work", "career", "job"]):
-            hashtags.extend(["#work", "#career"])
-        if any(word in content_lower for word in ["health", "fitness", "exercise"]):
-            hashtags.extend(["#health", "#fitness"])
-
-        # Ensure we don't have too many hashtags
-        hashtags = list(set(hashtags))[:5]  # Max 5 hashtags
+        # API-specific hashtags first, then content-based ones (single regex
+        # pass over the content), deduplicated in order and capped at 5
+        api_tags = _API_HASHTAGS.get(api_name, _DEFAULT_HASHTAGS)
+        keyword_tags = chain.from_iterable(
+            _KEYWORD_HASHTAGS[m.group(0).lower()] for m in _KEYWORD_RE.finditer(content)
+        )
+        hashtags = list(dict.fromkeys(chain(api_tags, keyword_tags)))[:5]
 
         return hashtags
 
     def _update_post_counters(self, post_type: str):
         """Update post counters in database"""
         try:
-            # Get current counts
-            posts_today = self.database_manager.get_posts_today()
-            random_posts_today = self.database_manager.get_posts_today("RANDOM")
-            scheduled_posts_today = self.database_manager.get_posts_today("SCHEDULED")
+            # Get current counts in a single round-trip
+            counts = self.database_manager.get_posts_today_grouped()
+            posts_today = counts.get("TOTAL", 0)
+            random_posts_today = counts.get("RANDOM", 0)
+            scheduled_posts_today = counts.get("SCHEDULED", 0)
 
             # Update based on post type
             if post_type == "RANDOM":
@@ -211,36 +268,27 @@ class AutomatedPosterBot:
             )
 
         except Exception as e:
-            self.logger.error(f"Error updating post counters: {e}")
+            self.logger.error("Error updating post counters: %s", e)
 
-    def post_callback(self, post_type: str):
-        """Callback function for scheduled posts"""
+    def post_callback(self, post_type: str) -> bool:
+        """Callback function for scheduled posts; returns True if a post was made"""
         try:
-            self.logger.info(f"Scheduled {post_type} post triggered")
+            self.logger.info("Scheduled %s post triggered", post_type)
 
-            # Check if we should make the post
-            if post_type == "RANDOM":
-                posts_today = self.database_manager.get_posts_today("RANDOM")
-                if posts_today >= 5:  # Max 5 random posts per day
-                    self.logger.info("Random post limit reached for today")
-                    return
-            elif post_type == "SCHEDULED":
-                posts_today = self.database_manager.get_posts_today("SCHEDULED")
-                if posts_today >= 1:  # Max 1 scheduled post per day
-                    self.logger.info("Scheduled post already made today")
-                    return
-
-            # Make the post
+            # Make the post (the scheduler checked the daily limits already)
             success = self.make_post(post_type)
 
             if success:
-                self.logger.info(f"Scheduled {post_type} post completed successfully")
+                self.logger.info("Scheduled %s post completed successfully", post_type)
             else:
-                self.logger.error(f"Scheduled {post_type} post failed")
+                self.logger.error("Scheduled %s post failed", post_type)
+
+            return success
 
         except Exception as e:
-            self.logger.error(f"Error in post callback: {e}")
+            self.logger.error("Error in post callback: %s", e)
             send_error_notification(str(e), f"Scheduled {post_type} Post Error")
+            return False
 
     def start(self):
         """Start the bot and begin automated posting"""
@@ -249,6 +297,7 @@ class AutomatedPosterBot:
                 raise Exception("Bot initialization failed")
 
             self.logger.info("Starting Automated Poster Bot...")
+            self._stop_event.clear()
 
             # Update bot status
             self.database_manager.update_bot_status(is_running=True)
@@ -261,16 +310,20 @@ class AutomatedPosterBot:
 
             self.logger.info("Bot started successfully")
 
-            # Keep the main thread alive
+            # Treat SIGTERM (systemd/docker stop) like Ctrl+C, so stop() runs
+            # and queued post logs are written before the process exits
+            if threading.current_thread() is threading.main_thread():
+                signal.signal(signal.SIGTERM, _raise_keyboard_interrupt)
+
+            # Keep the main thread alive until stop() signals the event
             try:
-                while self.is_running:
-                    time.sleep(1)
+                self._stop_event.wait()
             except KeyboardInterrupt:
                 self.logger.info("Received interrupt signal")
                 self.stop()
 
         except Exception as e:
-            self.logger.error(f"Error starting bot: {e}")
+            self.logger.error("Error starting bot: %s", e)
             send_error_notification(str(e), "Bot Start Error")
             self.stop()
             raise
@@ -295,7 +348,10 @@ class AutomatedPosterBot:
             self.logger.info("Bot stopped successfully")
 
         except Exception as e:
-            self.logger.error(f"Error stopping bot: {e}")
+            self.logger.error("Error stopping bot: %s", e)
+        finally:
+            # Always release the main thread waiting in start()
+            self._stop_event.set()
 
     def get_status(self) -> Dict:
         """Get current bot status"""
@@ -321,7 +377,7 @@ class AutomatedPosterBot:
             return status
 
         except Exception as e:
-            self.logger.error(f"Error getting status: {e}")
+            self.logger.error("Error getting status: %s", e)
             return {"is_running": False, "error": str(e)}
 
     def make_test_post(self) -> bool:
@@ -352,7 +408,7 @@ class AutomatedPosterBot:
                 # Update bot status counters
                 self._update_post_counters("TEST")
                 
-                self.logger.info(f"Test post logged to database (ID: {post_id})")
+                self.logger.info("Test post logged to database (ID: %s)", post_id)
                 return True
 
             result = self.api_client.post_content(
@@ -367,9 +423,9 @@ class AutomatedPosterBot:
                 self.logger.info("Test post successful")
                 return True
             else:
-                self.logger.error(f"Test post failed: {result.get('error')}")
+                self.logger.error("Test post failed: %s", result.get("error"))
                 return False
 
         except Exception as e:
-            self.logger.error(f"Error making test post: {e}")
+            self.logger.error("Error making test post: %s", e)
             return False
@@ -5,23 +5,139 @@ This module handles all database operations including connection management,
 table creation, and post logging.
 """
 
+import atexit
 import logging
+import threading
+import weakref
 import mysql.connector
-from mysql.connector import Error
+from mysql.connector import Error, InterfaceError, OperationalError, pooling
+from collections import OrderedDict, deque
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 from contextlib import contextmanager
+from functools import lru_cache
 import json
 
 from ..config.settings import Config
 
+# Prepared statements kept per pooled connection (bounds max_prepared_stmt_count)
+STMT_CACHE_SIZE = 32
+
+# Queued post log rows are flushed once this many are buffered ...
+LOG_BATCH_SIZE = 64
+# ... or by a timer this many seconds after the first one was queued
+LOG_FLUSH_INTERVAL = 2.0
+# Oldest rows are dropped beyond this many (e.g. while the database is down)
+LOG_BUFFER_MAX = 1024
+# A row the database keeps rejecting is dropped after this many writes
+LOG_MAX_ATTEMPTS = 3
+
+# posted_at is stamped by the server; MySQL lets a VALUES expression read a
+# column assigned earlier in the same row
+SQL_LOG_POST = """
+    INSERT INTO posts
+        (post_type, content, title, hashtags, api_source, status, error_message,
+         posted_at)
+    VALUES (%s, %s, %s, %s, %s, %s, %s,
+            CASE WHEN status = 'success' THEN CURRENT_TIMESTAMP ELSE NULL END)
+"""
+# Success-path insert: status and posted_at are fixed, so no branching per row
+SQL_LOG_SUCCESS = """
+    INSERT INTO posts
+        (post_type, content, title, hashtags, api_source, status, posted_at)
+    VALUES (%s, %s, %s, %s, %s, 'success', CURRENT_TIMESTAMP)
+"""
+# Range predicates (rather than DATE(created_at)) so idx_created_at can be used
+SQL_TODAY_RANGE = "created_at >= CURDATE() AND created_at < CURDATE() + INTERVAL 1 DAY"
+SQL_GET_POSTS_TODAY = f"SELECT COUNT(*) FROM posts WHERE {SQL_TODAY_RANGE}"
+SQL_GET_POSTS_TODAY_BYTYPE = f"""
+    SELECT COUNT(*) FROM posts
+    WHERE {SQL_TODAY_RANGE} AND post_type = %s
+"""
+SQL_GET_POSTS_TODAY_GROUPED = f"""
+    SELECT post_type, COUNT(*) FROM posts
+    WHERE {SQL_TODAY_RANGE}
+    GROUP BY post_type
+"""
+SQL_GET_SUCCESSFUL_POSTS_TODAY_GROUPED = f"""
+    SELECT post_type, COUNT(*) FROM posts
+    WHERE {SQL_TODAY_RANGE} AND status = 'success'
+    GROUP BY post_type
+"""
+SQL_GET_LAST_POST = """
+    SELECT posted_at FROM posts
+    WHERE status = 'success' AND posted_at IS NOT NULL
+    ORDER BY posted_at DESC LIMIT 1
+"""
+SQL_UPDATE_STATUS = """
+    UPDATE bot_status SET
+        is_running = COALESCE(%s, is_running),
+        last_post_time = COALESCE(%s, last_post_time),
+        posts_today = COALESCE(%s, posts_today),
+        random_posts_today = COALESCE(%s, random_posts_today),
+        scheduled_posts_today = COALESCE(%s, scheduled_posts_today)
+    WHERE id = 1
+"""
+
+# Indexes added to existing posts tables by create_tables
+POSTS_LATE_INDEXES = {
+    # Covers the per-type "posts today" counts without row lookups
+    "idx_type_created": "post_type, created_at",
+    # Lets the last-post lookup read backwards from the newest posted_at
+    "idx_posted_at": "posted_at",
+}
+
+
+@lru_cache(maxsize=256)
+def _encode_hashtags(tags: tuple) -> str:
+    """JSON-encode a hashtag list (the same few sets recur all day)"""
+    return json.dumps(list(tags))
+
+
+# Managers whose queued post logs are flushed when the process exits
+_managers: "weakref.WeakSet[DatabaseManager]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_all_post_logs():
+    """Write rows still queued at exit (e.g. a one-off CLI post)"""
+    for manager in list(_managers):
+        try:
+            manager.flush_post_logs()
+        except Exception as e:
+            manager.logger.error(f"Failed to flush post logs at exit: {e}")
+
+
+def _raw_connection(connection):
+    """The driver connection behind a pooled wrapper
+
+    The pool hands out a new wrapper on every checkout, so per-connection
+    state has to live on the connection it wraps.
+    """
+    return getattr(connection, "_cnx", connection)
+
+
+def _session_cache(raw, name: str) -> "OrderedDict[Any, Any]":
+    """Per-connection cache that is discarded when the connection reconnects
+
+    The pool reconnects a dropped connection (e.g. after wait_timeout) in
+    place, and cursors and statement handles from the old server session
+    are invalid on the new one. The server thread id identifies the session.
+    """
+    session = raw.connection_id
+    cached = getattr(raw, name, None)
+    if cached is None or cached[0] != session:
+        cached = (session, OrderedDict())
+        setattr(raw, name, cached)
+    return cached[1]
+
 
 class DatabaseManager:
     """Manages database connections and operations"""
 
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-        self.connection = None
+        self._pool = None
         self._connection_params = {
             "host": Config.Database.HOST,
             "port": Config.Database.PORT,
@@ -30,40 +146,174 @@ class DatabaseManager:
             "password": Config.Database.PASSWORD,
             "charset": "utf8mb4",
             "collation": "utf8mb4_unicode_ci",
+            # C extension parses the wire protocol natively; pure Python if absent
+            "use_pure": not mysql.connector.HAVE_CEXT,
+            # Single statements commit themselves, so reads never leave an open
+            # snapshot on a pooled connection and need no COMMIT round trip
+            "autocommit": True,
         }
+        # Only an explicitly configured socket replaces TCP: the server on it
+        # may not be the one on DB_PORT, and MySQL authenticates socket
+        # logins as user@localhost rather than user@127.0.0.1
+        if Config.Database.UNIX_SOCKET:
+            self._connection_params["unix_socket"] = Config.Database.UNIX_SOCKET
+        # Queued post log rows as (values, failed write attempts)
+        self._log_buffer = deque()
+        self._flush_lock = threading.Lock()
+        self._flush_timer = None
+        _managers.add(self)
 
     def connect(self) -> bool:
-        """Establish database connection"""
+        """Create the connection pool (opens pool_size connections up front)"""
+        if self._pool is not None:
+            return True
+
         try:
-            self.connection = mysql.connector.connect(**self._connection_params)
-            self.logger.info("Database connection established successfully")
+            self._pool = pooling.MySQLConnectionPool(
+                pool_name="autopost",
+                pool_size=Config.Database.POOL_SIZE,
+                # A session reset would deallocate the cached prepared statements
+                pool_reset_session=False,
+                **self._connection_params,
+            )
+            self.logger.info(
+                f"Database connection pool established "
+                f"({self._pool.pool_size} connections)"
+            )
             return True
         except Error as e:
             self.logger.error(f"Failed to connect to database: {e}")
             return False
 
     def disconnect(self):
-        """Close database connection"""
-        if self.connection and self.connection.is_connected():
-            self.connection.close()
-            self.logger.info("Database connection closed")
+        """Flush queued post logs and close all pooled database connections"""
+        with self._flush_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+
+        if self._pool is not None:
+            try:
+                self.flush_post_logs()
+            except Exception as e:
+                self.logger.error(f"Failed to flush post logs on disconnect: {e}")
+            self._close_pool_connections()
+            self._pool = None
+            self.logger.info("Database connection pool closed")
+
+    def _close_pool_connections(self):
+        """Close the idle pooled connections (the pool has no public close)"""
+        remove_connections = getattr(self._pool, "_remove_connections", None)
+        if remove_connections is None:
+            self.logger.warning("Connection pool cannot be closed explicitly")
+            return
+        try:
+            remove_connections()
+        except Error as e:
+            self.logger.error(f"Failed to close pooled connections: {e}")
 
     @contextmanager
-    def get_cursor(self):
-        """Context manager for database cursor"""
-        if not self.connection or not self.connection.is_connected():
+    def get_cursor(self, dictionary: bool = True):
+        """Context manager for a cursor on a connection checked out of the pool
+
+        Pass dictionary=False for plain tuple rows (cheaper for scalar reads).
+        """
+        if self._pool is None:
             if not self.connect():
                 raise Exception("Failed to connect to database")
 
-        cursor = self.connection.cursor(dictionary=True)
+        connection = self._pool.get_connection()
+        # One buffered cursor per row type is kept on each pooled connection;
+        # buffering means results are always fully read when the block exits
+        raw = _raw_connection(connection)
+        cursors = _session_cache(raw, "_autopost_cursors")
+        cursor = cursors.get(dictionary)
+        if cursor is None:
+            cursor = cursors[dictionary] = raw.cursor(
+                dictionary=dictionary, buffered=True
+            )
+
         try:
             yield cursor
-            self.connection.commit()
+            if connection.in_transaction:  # Only after an explicit START TRANSACTION
+                connection.commit()
         except Exception as e:
-            self.connection.rollback()
+            if connection.in_transaction:
+                connection.rollback()
+            # Don't hand a cursor in an unknown state to the next caller
+            del cursors[dictionary]
+            try:
+                cursor.close()
+            except Error:
+                pass
             raise e
         finally:
-            cursor.close()
+            connection.close()  # Returns the connection to the pool
+
+    @contextmanager
+    def get_prepared_cursor(self, sql: str):
+        """Context manager for a cached server-side prepared cursor for ``sql``
+
+        Rows come back as tuples rather than dicts.
+        """
+        if self._pool is None:
+            if not self.connect():
+                raise Exception("Failed to connect to database")
+
+        connection = self._pool.get_connection()
+        raw = _raw_connection(connection)
+        cache = _session_cache(raw, "_autopost_statements")
+        try:
+            yield self._cached_statement(raw, cache, sql)
+            if connection.in_transaction:
+                connection.commit()
+        except Exception as e:
+            self._discard_statement(raw, cache, sql, e)
+            raise e
+        finally:
+            connection.close()  # Returns the connection to the pool
+
+    def _discard_statement(self, raw, cache: OrderedDict, sql: str, error: Exception):
+        """Forget a statement that failed, and the connection if it was lost"""
+        cursor = cache.pop(sql, None)
+        if isinstance(error, (InterfaceError, OperationalError)):
+            # The session is likely gone: drop every handle and the link, so
+            # the pool reconnects on the next checkout instead of reusing it
+            cache.clear()
+            try:
+                raw.disconnect()
+            except Error:
+                pass
+            return
+
+        try:
+            if raw.in_transaction:
+                raw.rollback()
+            if cursor is not None:
+                cursor.close()
+        except Error:
+            pass
+
+    @staticmethod
+    def _cached_statement(raw, cache: OrderedDict, sql: str):
+        """Return the prepared cursor for ``sql`` on this connection (LRU cached)"""
+        cursor = cache.get(sql)
+        if cursor is None:
+            cursor = raw.cursor(prepared=True)
+            cache[sql] = cursor
+            if len(cache) > STMT_CACHE_SIZE:
+                _, evicted = cache.popitem(last=False)
+                evicted.close()
+        else:
+            cache.move_to_end(sql)
+        return cursor
+
+    def scalar(self, sql: str, params: tuple = ()) -> Any:
+        """Run a prepared query and return the first column of its first row"""
+        with self.get_prepared_cursor(sql) as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+            return rows[0][0] if rows else None
 
     def create_tables(self):
         """Create necessary database tables if they don't exist"""
@@ -82,7 +332,9 @@ class DatabaseManager:
                     posted_at TIMESTAMP NULL,
                     INDEX idx_post_type (post_type),
                     INDEX idx_created_at (created_at),
-                    INDEX idx_status (status)
+                    INDEX idx_status (status),
+                    INDEX idx_type_created (post_type, created_at),
+                    INDEX idx_posted_at (posted_at)
                 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
             """,
             "bot_status": """
@@ -116,12 +368,15 @@ class DatabaseManager:
         }
 
         try:
-            with self.get_cursor() as cursor:
-                for table_name, sql in tables_sql.items():
-                    cursor.execute(sql)
-                    self.logger.info(
-                        f"Table '{table_name}' created/verified successfully"
-                    )
+            with self.get_cursor(dictionary=False) as cursor:
+                # All CREATE statements in one round trip; each result must be
+                # consumed for the batch to run to completion
+                for _ in cursor.execute(";".join(tables_sql.values()), multi=True):
+                    pass
+                self.logger.info(
+                    f"Tables {', '.join(tables_sql)} created/verified successfully"
+                )
+                self._ensure_posts_indexes(cursor)
 
             # Insert default bot status if not exists
             self._initialize_bot_status()
@@ -130,18 +385,33 @@ class DatabaseManager:
             self.logger.error(f"Failed to create tables: {e}")
             raise
 
+    def _ensure_posts_indexes(self, cursor):
+        """Add indexes introduced after the posts table was first created"""
+        cursor.execute(
+            """
+            SELECT index_name FROM information_schema.statistics
+            WHERE table_schema = DATABASE() AND table_name = 'posts'
+        """
+        )
+        existing = {name for (name,) in cursor.fetchall()}
+
+        for name, columns in POSTS_LATE_INDEXES.items():
+            if name not in existing:
+                cursor.execute(f"ALTER TABLE posts ADD INDEX {name} ({columns})")
+                self.logger.info(f"Added index {name} to posts")
+
     def _initialize_bot_status(self):
         """Initialize bot status record if it doesn't exist"""
         try:
-            with self.get_cursor() as cursor:
-                cursor.execute("SELECT COUNT(*) as count FROM bot_status")
-                if cursor.fetchone()["count"] == 0:
-                    cursor.execute(
-                        """
-                        INSERT INTO bot_status (is_running, posts_today, random_posts_today, scheduled_posts_today)
-                        VALUES (FALSE, 0, 0, 0)
+            with self.get_cursor(dictionary=False) as cursor:
+                cursor.execute(
                     """
-                    )
+                    INSERT INTO bot_status (is_running, posts_today, random_posts_today, scheduled_posts_today)
+                    SELECT FALSE, 0, 0, 0 FROM DUAL
+                    WHERE NOT EXISTS (SELECT 1 FROM bot_status)
+                """
+                )
+                if cursor.rowcount:
                     self.logger.info("Bot status initialized")
         except Exception as e:
             self.logger.error(f"Failed to initialize bot status: {e}")
@@ -156,34 +426,175 @@ class DatabaseManager:
         status: str = "success",
         error_message: str = None,
     ) -> int:
-        """Log a post attempt to the database"""
+        """Log a post attempt to the database immediately and return its ID
+
+        Any rows already queued with queue_post_log() go out in the same batch.
+        """
         try:
-            with self.get_cursor() as cursor:
-                sql = """
-                    INSERT INTO posts (post_type, content, title, hashtags, api_source, status, error_message, posted_at)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                """
-                values = (
-                    post_type,
-                    content,
-                    title,
-                    json.dumps(hashtags) if hashtags else None,
-                    api_source,
-                    status,
-                    error_message,
-                    datetime.now() if status == "success" else None,
-                )
+            self.queue_post_log(
+                post_type, content, title, hashtags, api_source, status, error_message
+            )
+            post_id = self.flush_post_logs()
+
+            self.logger.info(f"Post logged with ID: {post_id}")
+            return post_id
+
+        except Exception as e:
+            self.logger.error(f"Failed to log post: {e}")
+            raise
 
-                cursor.execute(sql, values)
+    def log_success_post(
+        self,
+        post_type: str,
+        content: str,
+        title: str = None,
+        hashtags: List[str] = None,
+        api_source: str = None,
+    ) -> int:
+        """Log a successful post immediately and return its ID"""
+        hashtags_json = _encode_hashtags(tuple(hashtags)) if hashtags else None
+        try:
+            with self.get_prepared_cursor(SQL_LOG_SUCCESS) as cursor:
+                cursor.execute(
+                    SQL_LOG_SUCCESS,
+                    (post_type, content, title, hashtags_json, api_source),
+                )
                 post_id = cursor.lastrowid
 
-                self.logger.info(f"Post logged with ID: {post_id}")
-                return post_id
+            self.logger.info(f"Post logged with ID: {post_id}")
+            return post_id
 
         except Exception as e:
             self.logger.error(f"Failed to log post: {e}")
             raise
 
+    def queue_post_log(
+        self,
+        post_type: str,
+        content: str,
+        title: str = None,
+        hashtags: List[str] = None,
+        api_source: str = None,
+        status: str = "success",
+        error_message: str = None,
+    ):
+        """Buffer a post log row; a background flush writes it within seconds"""
+        values = (
+            post_type,
+            content,
+            title,
+            _encode_hashtags(tuple(hashtags)) if hashtags else None,
+            api_source,
+            status,
+            error_message,
+        )
+
+        with self._flush_lock:
+            self._log_buffer.append((values, 0))
+            self._trim_log_buffer()
+            batch_full = len(self._log_buffer) >= LOG_BATCH_SIZE
+            if not batch_full:
+                self._arm_flush_timer()
+
+        if batch_full:
+            self.flush_post_logs()
+
+    def _arm_flush_timer(self):
+        """Schedule a background flush unless one is pending (lock held)"""
+        if self._flush_timer is None:
+            self._flush_timer = threading.Timer(
+                LOG_FLUSH_INTERVAL, self._flush_on_timer
+            )
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def _flush_on_timer(self):
+        """Timer callback: flush, and try again later if rows remain"""
+        with self._flush_lock:
+            self._flush_timer = None
+        try:
+            self.flush_post_logs()
+        except Exception as e:
+            self.logger.error(f"Failed to flush post logs: {e}")
+        with self._flush_lock:
+            if self._log_buffer:
+                self._arm_flush_timer()
+
+    def _trim_log_buffer(self):
+        """Drop the oldest queued rows beyond LOG_BUFFER_MAX (lock held)"""
+        while len(self._log_buffer) > LOG_BUFFER_MAX:
+            (post_type, content, *_), _ = self._log_buffer.popleft()
+            self.logger.error(
+                f"Post log buffer full, dropping {post_type} post: {content[:50]!r}"
+            )
+
+    def _requeue_failed_log(self, entry, error: Exception):
+        """Retry a rejected row on a later flush, or drop it after enough tries"""
+        values, attempts = entry
+        attempts += 1
+        if attempts < LOG_MAX_ATTEMPTS:
+            # At the back, so it can't hold up the rows queued after it
+            self._log_buffer.append((values, attempts))
+            return
+        self.logger.error(
+            f"Dropping post log after {attempts} failed writes ({error}): {values}"
+        )
+
+    def _write_post_logs(self, rows: List[tuple]) -> int:
+        """INSERT post log rows in one round trip; returns the last inserted ID"""
+        if len(rows) == 1:
+            with self.get_prepared_cursor(SQL_LOG_POST) as cursor:
+                cursor.execute(SQL_LOG_POST, rows[0])
+                return cursor.lastrowid
+
+        # executemany() sends one multi-row INSERT; lastrowid is the first ID
+        with self.get_cursor() as cursor:
+            cursor.executemany(SQL_LOG_POST, rows)
+            return cursor.lastrowid + cursor.rowcount - 1
+
+    def flush_post_logs(self) -> Optional[int]:
+        """Write all queued post logs; returns the ID of the last queued row
+
+        Rows stay queued while the database is unreachable. A batch the
+        database rejects is retried row by row, so one bad row only delays
+        itself, and is dropped after LOG_MAX_ATTEMPTS writes.
+        """
+        with self._flush_lock:
+            if not self._log_buffer:
+                return None
+
+            entries = list(self._log_buffer)
+            self._log_buffer.clear()
+
+            try:
+                return self._write_post_logs([values for values, _ in entries])
+            except (InterfaceError, OperationalError):
+                # Database unreachable: keep everything for a later flush
+                self._log_buffer.extendleft(reversed(entries))
+                self._trim_log_buffer()
+                raise
+            except Error as e:
+                if len(entries) == 1:
+                    self._requeue_failed_log(entries[0], e)
+                    raise
+
+            # Some row was rejected: write them one at a time to isolate it
+            post_id, error = None, None
+            for i, entry in enumerate(entries):
+                try:
+                    post_id, error = self._write_post_logs([entry[0]]), None
+                except (InterfaceError, OperationalError):
+                    self._log_buffer.extendleft(reversed(entries[i:]))
+                    self._trim_log_buffer()
+                    raise
+                except Error as e:
+                    self._requeue_failed_log(entry, e)
+                    error = e
+
+            if error is not None:
+                raise error  # The last queued row (the caller's) was rejected
+            return post_id
+
     def update_bot_status(
         self,
         is_running: bool = None,
@@ -192,38 +603,21 @@ class DatabaseManager:
         random_posts_today: int = None,
         scheduled_posts_today: int = None,
     ):
-        """Update bot status in the database"""
-        try:
-            with self.get_cursor() as cursor:
-                update_fields = []
-                values = []
-
-                if is_running is not None:
-                    update_fields.append("is_running = %s")
-                    values.append(is_running)
+        """Update bot status in the database (None leaves a field unchanged)"""
+        values = (
+            is_running,
+            last_post_time,
+            posts_today,
+            random_posts_today,
+            scheduled_posts_today,
+        )
+        if all(value is None for value in values):
+            return
 
-                if last_post_time is not None:
-                    update_fields.append("last_post_time = %s")
-                    values.append(last_post_time)
-
-                if posts_today is not None:
-                    update_fields.append("posts_today = %s")
-                    values.append(posts_today)
-
-                if random_posts_today is not None:
-                    update_fields.append("random_posts_today = %s")
-                    values.append(random_posts_today)
-
-                if scheduled_posts_today is not None:
-                    update_fields.append("scheduled_posts_today = %s")
-                    values.append(scheduled_posts_today)
-
-                if update_fields:
-                    sql = (
-                        f"UPDATE bot_status SET {', '.join(update_fields)} WHERE id = 1"
-                    )
-                    cursor.execute(sql, values)
-                    self.logger.info("Bot status updated successfully")
+        try:
+            with self.get_prepared_cursor(SQL_UPDATE_STATUS) as cursor:
+                cursor.execute(SQL_UPDATE_STATUS, values)
+            self.logger.info("Bot status updated successfully")
 
         except Exception as e:
             self.logger.error(f"Failed to update bot status: {e}")
@@ -260,37 +654,43 @@ class DatabaseManager:
     def get_posts_today(self, post_type: str = None) -> int:
         """Get number of posts made today"""
         try:
-            with self.get_cursor() as cursor:
-                if post_type:
-                    sql = """
-                        SELECT COUNT(*) as count FROM posts 
-                        WHERE DATE(created_at) = CURDATE() AND post_type = %s
-                    """
-                    cursor.execute(sql, (post_type,))
-                else:
-                    sql = "SELECT COUNT(*) as count FROM posts WHERE DATE(created_at) = CURDATE()"
-                    cursor.execute(sql)
+            if post_type:
+                sql, params = SQL_GET_POSTS_TODAY_BYTYPE, (post_type,)
+            else:
+                sql, params = SQL_GET_POSTS_TODAY, ()
 
-                result = cursor.fetchone()
-                return result["count"] if result else 0
+            return self.scalar(sql, params) or 0
 
         except Exception as e:
             self.logger.error(f"Failed to get posts count: {e}")
             return 0
 
+    def get_posts_today_grouped(self, successful_only: bool = False) -> Dict[str, int]:
+        """Get today's post counts per post type, plus a TOTAL, in one query
+
+        With successful_only, failed attempts logged today are not counted.
+        """
+        sql = (
+            SQL_GET_SUCCESSFUL_POSTS_TODAY_GROUPED
+            if successful_only
+            else SQL_GET_POSTS_TODAY_GROUPED
+        )
+        try:
+            with self.get_prepared_cursor(sql) as cursor:
+                cursor.execute(sql)
+                counts = dict(cursor.fetchall())
+
+            counts["TOTAL"] = sum(counts.values())
+            return counts
+
+        except Exception as e:
+            self.logger.error(f"Failed to get grouped posts count: {e}")
+            return {"TOTAL": 0}
+
     def get_last_post_time(self) -> Optional[datetime]:
         """Get the timestamp of the last successful post"""
         try:
-            with self.get_cursor() as cursor:
-                cursor.execute(
-                    """
-                    SELECT posted_at FROM posts 
-                    WHERE status = 'success' AND posted_at IS NOT NULL
-                    ORDER BY posted_at DESC LIMIT 1
-                """
-                )
-                result = cursor.fetchone()
-                return result["posted_at"] if result else None
+            return self.scalar(SQL_GET_LAST_POST)
 
         except Exception as e:
             self.logger.error(f"Failed to get last post time: {e}")
@@ -5,15 +5,113 @@ This module handles all scheduling operations including job management,
 timing calculations, and automated posting schedules.
 """
 
-import schedule
+import heapq
+import os
+import itertools
 import time
 import logging
 import threading
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Callable, Any
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, time as dt_time, timedelta
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, NamedTuple, Optional, Callable, Any
 
+from ..config.settings import Config
 from ..database.manager import DatabaseManager
 
+# Longest the scheduler thread parks between jobs, so wall-clock changes
+# (NTP, DST, suspend) are noticed within a minute
+MAX_IDLE_WAIT = 60.0
+
+# Retry delay after a failing scheduler iteration, doubled on each consecutive
+# failure (e.g. while the database is down) and reset once one succeeds
+ERROR_BACKOFF_MIN = 5.0
+ERROR_BACKOFF_MAX = MAX_IDLE_WAIT  # Jobs due meanwhile are at most this late
+
+# Touched by processes that post outside the scheduler (e.g. --post); the
+# scheduler re-reads its post counts from the database when its mtime changes
+POST_COUNTS_STAMP = Config.get_project_root() / ".autopost_posts_stamp"
+
+# Random post slots of the "Balanced Day" schedule, parsed once at import
+_STRATEGIC_SLOTS = tuple(
+    datetime.strptime(time_str, "%H:%M")
+    for time_str in (
+        "11:30",  # Late morning
+        "13:45",  # Early afternoon
+        "15:15",  # Mid afternoon
+        "17:30",  # Late afternoon
+        "19:00",  # Early evening
+        "20:45",  # Late evening
+    )
+)
+
+# Read-only schedule presets returned by get_schedule_variations()
+_SCHEDULE_VARIATIONS = (
+    MappingProxyType(
+        {
+            "name": "Morning Focus",
+            "daily_post_time": "09:00",
+            "random_posts_per_day": 5,
+            "start_time": "08:00",
+            "end_time": "20:00",
+            "times": ("10:30", "12:15", "14:45", "16:30", "18:15"),
+        }
+    ),
+    MappingProxyType(
+        {
+            "name": "Evening Focus",
+            "daily_post_time": "11:00",
+            "random_posts_per_day": 6,
+            "start_time": "09:00",
+            "end_time": "22:00",
+            "times": ("12:30", "14:15", "16:00", "17:45", "19:30", "21:15"),
+        }
+    ),
+    MappingProxyType(
+        {
+            "name": "Balanced Day",
+            "daily_post_time": "10:00",
+            "random_posts_per_day": 6,
+            "start_time": "08:00",
+            "end_time": "22:00",
+            "times": ("11:30", "13:45", "15:15", "17:30", "19:00", "20:45"),
+        }
+    ),
+)
+
+
+def _post_counts_stamp() -> Optional[int]:
+    """mtime of POST_COUNTS_STAMP in nanoseconds, or None if never touched"""
+    try:
+        return os.stat(POST_COUNTS_STAMP).st_mtime_ns
+    except OSError:
+        return None
+
+
+def mark_post_counts_stale():
+    """Tell running schedulers that posts were made outside of them"""
+    try:
+        POST_COUNTS_STAMP.touch()
+    except OSError as e:
+        logging.getLogger(__name__).warning("Could not mark post counts stale: %s", e)
+
+
+@lru_cache(maxsize=None)
+def _parse_at_time(at_time: str) -> dt_time:
+    """Parse an HH:MM job time (each job's time is re-used every day)"""
+    return datetime.strptime(at_time, "%H:%M").time()
+
+
+class ScheduledJob(NamedTuple):
+    """A post of ``post_type`` made every day at ``at_time`` (HH:MM, local time)"""
+
+    job_id: int
+    name: str
+    at_time: str
+    post_type: str
+    callback: Callable[[str], Optional[bool]]
+
 
 class PostScheduler:
     """Manages automated posting schedules"""
@@ -22,8 +120,17 @@ class PostScheduler:
         self.logger = logging.getLogger(__name__)
         self.database_manager = database_manager
         self.scheduler_thread = None
+        self._executor = None  # Runs due jobs so DB/API latency never delays timers
         self.is_running = False
-        self.jobs = {}
+        self.jobs: Dict[int, ScheduledJob] = {}
+        self._job_heap = []  # (next_run_epoch, job_id), earliest first
+        self._job_ids = itertools.count(1)
+        self._cv = threading.Condition()
+        # Today's successful post counts by type, synced from the DB at start,
+        # at day rollover and after mark_post_counts_stale(), and incremented
+        # in process after each successful post
+        self._post_counts: Optional[Dict[str, Any]] = None
+        self._post_counts_lock = threading.Lock()  # Jobs run on the worker pool
 
         # Default schedule configuration
         self.schedule_config = {
@@ -41,6 +148,17 @@ class PostScheduler:
             return
 
         self.is_running = True
+        try:
+            self._sync_post_counts()
+        except Exception as e:
+            self.logger.error("Failed to load today's post counts: %s", e)
+        self._executor = ThreadPoolExecutor(
+            # More workers than pooled connections would only wait on the pool
+            max_workers=max(
+                1, min(Config.Bot.SCHEDULER_WORKERS, Config.Database.POOL_SIZE)
+            ),
+            thread_name_prefix="scheduled-job",
+        )
         self.scheduler_thread = threading.Thread(
             target=self._run_scheduler, daemon=True
         )
@@ -49,33 +167,102 @@ class PostScheduler:
 
     def stop(self):
         """Stop the scheduler"""
-        self.is_running = False
+        with self._cv:
+            self.is_running = False
+            self._cv.notify_all()  # Wake the scheduler thread immediately
         if self.scheduler_thread:
             self.scheduler_thread.join(timeout=5)
+        if self._executor:
+            self._executor.shutdown(wait=True)  # Let in-flight posts finish
+            self._executor = None
+        try:
+            self.database_manager.flush_post_logs()
+        except Exception as e:
+            self.logger.error("Failed to flush post logs: %s", e)
         self.logger.info("Scheduler stopped")
 
     def _run_scheduler(self):
-        """Main scheduler loop"""
+        """Main scheduler loop: sleep until the earliest job is due, then run it"""
+        backoff = ERROR_BACKOFF_MIN
         while self.is_running:
             try:
-                schedule.run_pending()
-                time.sleep(1)
-            except Exception as e:
-                self.logger.error(f"Error in scheduler loop: {e}")
-                time.sleep(5)  # Wait before retrying
+                for job in self._pop_due_jobs():
+                    self._executor.submit(
+                        self._execute_scheduled_post, job.post_type, job.callback
+                    )
+                backoff = ERROR_BACKOFF_MIN
 
-    def setup_daily_schedule(self, post_callback: Callable[[str], None]):
+                with self._cv:
+                    if self.is_running:
+                        self._cv.wait(self._seconds_until_next_job())
+            except Exception as e:
+                self.logger.error("Error in scheduler loop: %s", e)
+                with self._cv:
+                    self._cv.wait(backoff)  # Wait before retrying
+                backoff = min(backoff * 2, ERROR_BACKOFF_MAX)
+
+    @staticmethod
+    def _next_run(at_time: str) -> float:
+        """Epoch time of the next occurrence of ``at_time`` (HH:MM) after now"""
+        now = datetime.now()
+        run_at = datetime.combine(now.date(), _parse_at_time(at_time))
+        if run_at <= now:
+            run_at += timedelta(days=1)
+        return run_at.timestamp()
+
+    def _add_job(
+        self,
+        name: str,
+        at_time: str,
+        post_type: str,
+        callback: Callable[[str], Optional[bool]],
+    ) -> int:
+        """Add a daily job and wake the scheduler thread so it can re-plan"""
+        next_run = self._next_run(at_time)
+        with self._cv:
+            job = ScheduledJob(next(self._job_ids), name, at_time, post_type, callback)
+            self.jobs[job.job_id] = job
+            heapq.heappush(self._job_heap, (next_run, job.job_id))
+            self._cv.notify_all()
+        return job.job_id
+
+    def _clear_jobs(self):
+        """Remove every job"""
+        with self._cv:
+            self.jobs.clear()
+            self._job_heap.clear()
+            self._cv.notify_all()
+
+    def _pop_due_jobs(self) -> List[ScheduledJob]:
+        """Pop all due jobs, re-queueing each for its next daily run"""
+        due = []
+        with self._cv:
+            now = time.time()
+            while self._job_heap and self._job_heap[0][0] <= now:
+                _, job_id = heapq.heappop(self._job_heap)
+                job = self.jobs.get(job_id)
+                if job is None:
+                    continue  # Removed since it was queued
+                due.append(job)
+                heapq.heappush(self._job_heap, (self._next_run(job.at_time), job_id))
+        return due
+
+    def _seconds_until_next_job(self) -> float:
+        """Seconds to wait before the earliest job is due (capped at MAX_IDLE_WAIT)"""
+        if not self._job_heap:
+            return MAX_IDLE_WAIT
+        return min(max(self._job_heap[0][0] - time.time(), 0.0), MAX_IDLE_WAIT)
+
+    def setup_daily_schedule(self, post_callback: Callable[[str], Optional[bool]]):
         """Setup the daily posting schedule"""
         try:
             # Clear existing schedules
-            schedule.clear()
+            self._clear_jobs()
 
             # Setup daily post at 12:00 PM
             daily_time = self.schedule_config["daily_post_time"]
-            schedule.every().day.at(daily_time).do(
-                lambda: self._execute_scheduled_post("SCHEDULED", post_callback)
-            )
-            self.logger.info(f"Daily post scheduled for {daily_time}")
+            self._add_job("SCHEDULED post", daily_time, "SCHEDULED", post_callback)
+            self.logger.info("Daily post scheduled for %s", daily_time)
 
             # Setup random posts throughout the day
             self._setup_random_posts(post_callback)
@@ -84,61 +271,35 @@ class PostScheduler:
             self._log_schedule()
 
         except Exception as e:
-            self.logger.error(f"Failed to setup daily schedule: {e}")
+            self.logger.error("Failed to setup daily schedule: %s", e)
             raise
 
-    def _setup_random_posts(self, post_callback: Callable[[str], None]):
+    def _setup_random_posts(self, post_callback: Callable[[str], Optional[bool]]):
         """Setup random posts throughout the day"""
         try:
             start_time = datetime.strptime(self.schedule_config["start_time"], "%H:%M")
             end_time = datetime.strptime(self.schedule_config["end_time"], "%H:%M")
-            interval_hours = self.schedule_config["random_post_interval"]
             num_posts = self.schedule_config["random_posts_per_day"]
 
             # Calculate time slots for random posts
             time_slots = self._calculate_time_slots(start_time, end_time, num_posts)
 
-            for i, slot in enumerate(time_slots):
-                schedule.every().day.at(slot.strftime("%H:%M")).do(
-                    lambda slot_num=i: self._execute_scheduled_post(
-                        "RANDOM", post_callback
-                    )
-                )
-                self.logger.info(
-                    f"Random post {i+1} scheduled for {slot.strftime('%H:%M')}"
-                )
+            for i, slot in enumerate(time_slots, 1):
+                at_time = slot.strftime("%H:%M")
+                self._add_job(f"RANDOM post {i}", at_time, "RANDOM", post_callback)
+                self.logger.info("Random post %d scheduled for %s", i, at_time)
 
         except Exception as e:
-            self.logger.error(f"Failed to setup random posts: {e}")
+            self.logger.error("Failed to setup random posts: %s", e)
             raise
 
     def get_schedule_variations(self) -> List[Dict[str, Any]]:
         """Get different schedule variations for variety"""
+        # Fresh dicts, as before, so callers can edit them without touching
+        # the shared presets
         return [
-            {
-                "name": "Morning Focus",
-                "daily_post_time": "09:00",
-                "random_posts_per_day": 5,
-                "start_time": "08:00",
-                "end_time": "20:00",
-                "times": ["10:30", "12:15", "14:45", "16:30", "18:15"]
-            },
-            {
-                "name": "Evening Focus", 
-                "daily_post_time": "11:00",
-                "random_posts_per_day": 6,
-                "start_time": "09:00",
-                "end_time": "22:00",
-                "times": ["12:30", "14:15", "16:00", "17:45", "19:30", "21:15"]
-            },
-            {
-                "name": "Balanced Day",
-                "daily_post_time": "10:00",
-                "random_posts_per_day": 6,
-                "start_time": "08:00",
-                "end_time": "22:00",
-                "times": ["11:30", "13:45", "15:15", "17:30", "19:00", "20:45"]
-            }
+            {**variation, "times": list(variation["times"])}
+            for variation in _SCHEDULE_VARIATIONS
         ]
 
     def _calculate_time_slots(
@@ -146,99 +307,117 @@ class PostScheduler:
     ) -> List[datetime]:
         """Calculate time slots for random posts with better distribution"""
         slots = []
-        
-        # Use the "Balanced Day" schedule as default
-        strategic_times = [
-            "11:30",  # Late morning
-            "13:45",  # Early afternoon
-            "15:15",  # Mid afternoon
-            "17:30",  # Late afternoon
-            "19:00",  # Early evening
-            "20:45",  # Late evening
-        ]
-        
-        # Use strategic times if we have enough slots
-        if num_slots <= len(strategic_times):
-            for i in range(num_slots):
-                time_str = strategic_times[i]
-                slot_time = datetime.strptime(time_str, "%H:%M")
+
+        # Use the "Balanced Day" strategic times if we have enough slots
+        if num_slots <= len(_STRATEGIC_SLOTS):
+            start, end = start_time.time(), end_time.time()
+            for slot_time in _STRATEGIC_SLOTS[:num_slots]:
                 # Ensure it's within our time range
-                if start_time.time() <= slot_time.time() <= end_time.time():
+                if start <= slot_time.time() <= end:
                     slots.append(slot_time)
         else:
-            # Fallback to calculated distribution
-            total_minutes = (end_time - start_time).total_seconds() / 60
-            interval_minutes = total_minutes / (num_slots + 1)  # +1 to avoid edge times
-
-            for i in range(num_slots):
-                slot_minutes = start_time.minute + (i + 1) * interval_minutes
-                slot_hour = start_time.hour + int(slot_minutes // 60)
-                slot_minute = int(slot_minutes % 60)
-
-                # Ensure we don't exceed end time
-                if slot_hour > end_time.hour or (
-                    slot_hour == end_time.hour and slot_minute >= end_time.minute
-                ):
-                    break
-
-                slot_time = start_time.replace(hour=slot_hour, minute=slot_minute)
-                slots.append(slot_time)
+            # Fallback to evenly spaced slots; the last one lands at
+            # num_slots/(num_slots+1) of the window, so none reaches end_time
+            interval = (end_time - start_time) / (num_slots + 1)
+            slots = [start_time + interval * (i + 1) for i in range(num_slots)]
 
         return slots
 
     def _execute_scheduled_post(
-        self, post_type: str, post_callback: Callable[[str], None]
+        self, post_type: str, post_callback: Callable[[str], Optional[bool]]
     ):
         """Execute a scheduled post"""
         try:
-            self.logger.info(f"Executing scheduled {post_type} post...")
+            self.logger.info("Executing scheduled %s post...", post_type)
 
             # Check if we should make the post
             if self._should_make_post(post_type):
-                post_callback(post_type)
-                self.logger.info(f"Scheduled {post_type} post completed")
+                if post_callback(post_type):
+                    self._count_post(post_type)
+                self.logger.info("Scheduled %s post completed", post_type)
             else:
-                self.logger.info(f"Skipping {post_type} post (conditions not met)")
+                self.logger.info("Skipping %s post (conditions not met)", post_type)
 
         except Exception as e:
-            self.logger.error(f"Error executing scheduled {post_type} post: {e}")
+            self.logger.error("Error executing scheduled %s post: %s", post_type, e)
 
     def _should_make_post(self, post_type: str) -> bool:
         """Check if we should make a post based on current conditions"""
         try:
-            # Get current post counts
-            posts_today = self.database_manager.get_posts_today()
-            random_posts_today = self.database_manager.get_posts_today("RANDOM")
-            scheduled_posts_today = self.database_manager.get_posts_today("SCHEDULED")
+            # In-process counts; the DB is only consulted when they go stale
+            counts = self._today_post_counts()
 
             # Check limits
             if post_type == "RANDOM":
-                return random_posts_today < self.schedule_config["random_posts_per_day"]
+                random_limit = self.schedule_config["random_posts_per_day"]
+                return counts.get("RANDOM", 0) < random_limit
             elif post_type == "SCHEDULED":
-                return scheduled_posts_today < 1  # Only one scheduled post per day
+                return counts.get("SCHEDULED", 0) < 1  # Only one scheduled post per day
 
             return True
 
         except Exception as e:
-            self.logger.error(f"Error checking post conditions: {e}")
+            self.logger.error("Error checking post conditions: %s", e)
             return False
 
+    def _sync_post_counts(self) -> Dict[str, Any]:
+        """Reload today's successful post counts by type from the database"""
+        stamp = _post_counts_stamp()  # Read first so a touch mid-query counts
+        grouped = self.database_manager.get_posts_today_grouped(successful_only=True)
+        counts = dict(grouped)
+        counts["date"] = datetime.now().date()
+        counts["stamp"] = stamp
+        with self._post_counts_lock:
+            self._post_counts = counts
+        return counts
+
+    def _today_post_counts(self) -> Dict[str, Any]:
+        """Today's post counts, re-synced after day rollover or outside posts"""
+        counts = self._post_counts
+        if (
+            counts is None
+            or counts["date"] != datetime.now().date()
+            or counts["stamp"] != _post_counts_stamp()
+        ):
+            counts = self._sync_post_counts()
+        return counts
+
+    def invalidate_post_counts(self):
+        """Re-read the post counts from the database before the next check"""
+        with self._post_counts_lock:
+            self._post_counts = None
+
+    def _count_post(self, post_type: str):
+        """Record a successful post in the in-process counts"""
+        counts = self._today_post_counts()
+        with self._post_counts_lock:
+            counts[post_type] = counts.get(post_type, 0) + 1
+            counts["TOTAL"] = counts.get("TOTAL", 0) + 1
+
     def _log_schedule(self):
         """Log the current schedule"""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return  # Skip building one message per job
+
         try:
-            jobs = schedule.get_jobs()
-            self.logger.info(f"Current schedule has {len(jobs)} jobs:")
+            jobs = list(self.jobs.values())
+            self.logger.info("Current schedule has %s jobs:", len(jobs))
 
             for job in jobs:
-                self.logger.info(f"  - {job.job_func.__name__} at {job.at_time}")
+                self.logger.info("  - %s at %s", job.name, job.at_time)
 
         except Exception as e:
-            self.logger.error(f"Error logging schedule: {e}")
+            self.logger.error("Error logging schedule: %s", e)
 
     def get_schedule_info(self) -> Dict[str, Any]:
         """Get information about the current schedule"""
         try:
-            jobs = schedule.get_jobs()
+            with self._cv:
+                jobs = [
+                    (next_run, self.jobs[job_id])
+                    for next_run, job_id in sorted(self._job_heap)
+                    if job_id in self.jobs
+                ]
 
             return {
                 "is_running": self.is_running,
@@ -248,28 +427,26 @@ class PostScheduler:
             }
 
         except Exception as e:
-            self.logger.error(f"Error getting schedule info: {e}")
+            self.logger.error("Error getting schedule info: %s", e)
             return {"is_running": self.is_running, "error": str(e)}
 
     def _get_next_jobs(self, jobs: List) -> List[Dict[str, Any]]:
-        """Get information about upcoming jobs"""
-        next_jobs = []
-
-        for job in jobs:
-            try:
-                next_run = job.next_run
-                if next_run:
-                    next_jobs.append(
-                        {
-                            "function": job.job_func.__name__,
-                            "next_run": next_run.isoformat(),
-                            "time_until": str(next_run - datetime.now()),
-                        }
-                    )
-            except Exception as e:
-                self.logger.warning(f"Error getting job info: {e}")
+        """Get information about upcoming jobs (one clock read for all of them)
 
-        return next_jobs
+        next_run and time_until keep their original string forms; next_run_ts
+        and seconds_until carry the same values as plain epoch seconds.
+        """
+        now = time.time()
+        return [
+            {
+                "function": job.name,
+                "next_run": datetime.fromtimestamp(next_run).isoformat(),
+                "time_until": str(timedelta(seconds=next_run - now)),
+                "next_run_ts": next_run,
+                "seconds_until": next_run - now,
+            }
+            for next_run, job in jobs
+        ]
 
     def update_schedule_config(self, new_config: Dict[str, Any]):
         """Update the schedule configuration"""
@@ -284,7 +461,7 @@ class PostScheduler:
                 self.start()
 
         except Exception as e:
-            self.logger.error(f"Error updating schedule config: {e}")
+            self.logger.error("Error updating schedule config: %s", e)
             raise
 
     def add_custom_job(
@@ -292,25 +469,29 @@ class PostScheduler:
     ) -> bool:
         """Add a custom job to the schedule"""
         try:
-            schedule.every().day.at(schedule_time).do(
-                lambda: self._execute_scheduled_post(job_type, job_func)
-            )
+            self._add_job(f"{job_type} job", schedule_time, job_type, job_func)
 
-            self.logger.info(f"Custom job added for {schedule_time}")
+            self.logger.info("Custom job added for %s", schedule_time)
             return True
 
         except Exception as e:
-            self.logger.error(f"Error adding custom job: {e}")
+            self.logger.error("Error adding custom job: %s", e)
             return False
 
     def remove_job(self, job_time: str) -> bool:
-        """Remove a job from the schedule"""
+        """Remove every job scheduled at ``job_time`` (HH:MM)"""
         try:
-            # This is a simplified implementation
-            # In a real scenario, you'd need to track job references
-            self.logger.info(f"Job removal requested for {job_time}")
-            return True
+            with self._cv:
+                job_ids = [
+                    job.job_id for job in self.jobs.values() if job.at_time == job_time
+                ]
+                for job_id in job_ids:
+                    del self.jobs[job_id]  # Its heap entry is skipped when popped
+                self._cv.notify_all()
+
+            self.logger.info("Removed %s job(s) at %s", len(job_ids), job_time)
+            return bool(job_ids)
 
         except Exception as e:
-            self.logger.error(f"Error removing job: {e}")
+            self.logger.error("Error removing job: %s", e)
             return False
@@ -5,6 +5,8 @@ Test script for RecentHPost API integration
 
 import os
 import sys
+from functools import lru_cache
+from unittest.mock import Mock, patch
 from dotenv import load_dotenv
 
 # Add the parent directory to the path to import the autopost package
@@ -14,6 +16,12 @@ from autopost.api.client import APIClient
 from autopost.config.settings import Config
 
 
+@lru_cache(maxsize=1)
+def _api_client() -> APIClient:
+    """One client (and keep-alive session) shared by every test"""
+    return APIClient()
+
+
 def test_api_connection():
     """Test the API connection and make a test post"""
     print("🔍 Testing RecentHPost API Connection...")
@@ -30,7 +38,7 @@ def test_api_connection():
         return False
 
     # Test API connection
-    api_client = APIClient()
+    api_client = _api_client()
 
     print(f"📡 Testing connection to: {Config.API_ENDPOINT}")
     print(f"🔑 Using API key: {Config.API_KEY[:10]}...")
@@ -47,7 +55,7 @@ def test_single_post():
     """Test making a single post"""
     print("\n📝 Testing single post...")
 
-    api_client = APIClient()
+    api_client = _api_client()
 
     test_content = "This is a test post from the Automated Poster Bot! 🤖"
     test_title = "API Test Post"
@@ -70,6 +78,59 @@ def test_single_post():
         return False
 
 
+def test_form_data_array_fields():
+    """Test that array form fields keep every value instead of the last one"""
+    api_client = _api_client()
+
+    form_data = api_client._build_form_data(
+        content="Array field test",
+        hashtags=["#one", "#two", "#three"],
+        media_urls=["https://example.com/a.png", "https://example.com/b.png"],
+    )
+    keys = [key for key, _ in form_data]
+
+    assert keys.count("countries_iso[]") == len(Config.API.COUNTRIES_ISO)
+    assert keys.count("hashtags[]") == 3
+    assert keys.count("media_files_urls[]") == 2
+
+
+def test_connection_probes_until_first_success():
+    """A fresh client probes even shortly after boot, then reuses a success"""
+    api_client = APIClient()
+    api_client._check_connection = Mock(return_value=False)
+
+    # The monotonic clock starts at boot, so early uptime must not look cached
+    with patch("autopost.api.client.time.monotonic", return_value=5.0):
+        assert not api_client.test_connection()
+        api_client._check_connection.return_value = True
+        assert api_client.test_connection()
+        assert api_client.test_connection()
+        assert api_client.test_connection(force=True)
+
+    assert api_client._check_connection.call_count == 3
+
+
+def test_probes_do_not_retry():
+    """Connection probes fail after one attempt; only posts are retried"""
+    api_client = _api_client()
+
+    probe_adapter = api_client._probe_session.get_adapter(Config.API.ENDPOINT)
+    post_adapter = api_client.session.get_adapter(Config.API.ENDPOINT)
+
+    assert probe_adapter.max_retries.total == 0
+    assert post_adapter.max_retries.total > 0
+
+
+def test_posts_are_not_retried_once_sent():
+    """Posts the server may already have published are never sent again"""
+    retry = _api_client().session.get_adapter(Config.API.ENDPOINT).max_retries
+
+    assert retry.read == 0
+    assert not retry.is_retry("POST", 500)
+    assert not retry.is_retry("POST", 504)
+    assert retry.is_retry("POST", 503)
+
+
 def main():
     """Main test function"""
     print("🚀 RecentHPost API Integration Test")
@@ -66,10 +66,10 @@ def test_content_fetching():
         # Test content fetching
         content_data = bot.content_fetcher.fetch_content()
 
-        if content_data and "content" in content_data:
+        if content_data and content_data.content:
             print("✅ Content fetching successful")
-            print(f"   Source: {content_data.get('api_name', 'Unknown')}")
-            print(f"   Content: {content_data['content'][:100]}...")
+            print(f"   Source: {content_data.api_name or 'Unknown'}")
+            print(f"   Content: {content_data.content[:100]}...")
             return True
         else:
             print("❌ Content fetching failed")
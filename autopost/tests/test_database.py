@@ -0,0 +1,181 @@
+"""
+Tests for DatabaseManager statement caching and post log buffering
+
+A fake pool and writer stand in for MySQL, so reconnects, dropped sessions
+and rejected rows can be simulated without a server.
+"""
+
+import os
+import sys
+import time
+from unittest.mock import Mock
+
+import pytest
+from mysql.connector import DatabaseError, OperationalError
+
+# Add the parent directory to the path to import the autopost package
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from autopost.database import manager as manager_module
+from autopost.database.manager import DatabaseManager, SQL_GET_POSTS_TODAY
+
+
+class FakeConnection:
+    """Driver connection whose server session id changes on reconnect"""
+
+    def __init__(self):
+        self.connection_id = 1
+        self.in_transaction = False
+        self.cursors = []
+        self.disconnected = False
+
+    def cursor(self, **kwargs):
+        cursor = Mock()
+        cursor.fetchall.return_value = [(3,)]
+        self.cursors.append(cursor)
+        return cursor
+
+    def disconnect(self):
+        self.disconnected = True
+
+
+@pytest.fixture
+def raw_connection():
+    return FakeConnection()
+
+
+@pytest.fixture
+def db_manager(raw_connection):
+    """A DatabaseManager whose pool always hands out ``raw_connection``"""
+    manager = DatabaseManager()
+    manager._pool = Mock()
+    manager._pool.get_connection.side_effect = lambda: Mock(
+        _cnx=raw_connection, in_transaction=False
+    )
+    return manager
+
+
+def test_prepared_statement_is_reused(db_manager, raw_connection):
+    """The same SQL on the same session reuses one prepared cursor"""
+    assert db_manager.scalar(SQL_GET_POSTS_TODAY) == 3
+    assert db_manager.scalar(SQL_GET_POSTS_TODAY) == 3
+
+    assert len(raw_connection.cursors) == 1
+    assert raw_connection.cursors[0].execute.call_count == 2
+
+
+def test_reconnect_discards_prepared_statements(db_manager, raw_connection):
+    """Statements prepared before a reconnect are not used on the new session"""
+    db_manager.scalar(SQL_GET_POSTS_TODAY)
+    stale = raw_connection.cursors[0]
+
+    # The pool reconnected the same connection object (e.g. after wait_timeout)
+    raw_connection.connection_id = 2
+    assert db_manager.scalar(SQL_GET_POSTS_TODAY) == 3
+
+    assert len(raw_connection.cursors) == 2
+    assert stale.execute.call_count == 1
+
+
+def test_lost_connection_drops_statement_and_connection(db_manager, raw_connection):
+    """A lost connection is dropped so the next checkout reconnects"""
+    db_manager.scalar(SQL_GET_POSTS_TODAY)
+    raw_connection.cursors[0].execute.side_effect = OperationalError("gone away")
+
+    with pytest.raises(OperationalError):
+        db_manager.scalar(SQL_GET_POSTS_TODAY)
+    assert raw_connection.disconnected
+
+    assert db_manager.scalar(SQL_GET_POSTS_TODAY) == 3
+    assert len(raw_connection.cursors) == 2
+
+
+def test_get_posts_today_recovers_after_reconnect(db_manager, raw_connection):
+    """Counts keep coming from the database once the session has been renewed"""
+    db_manager.scalar(SQL_GET_POSTS_TODAY)
+    raw_connection.connection_id = 2
+
+    assert db_manager.get_posts_today() == 3
+
+
+class FakeWriter:
+    """Stands in for DatabaseManager._write_post_logs, recording written rows"""
+
+    def __init__(self, reject=(), unreachable=False):
+        self.reject = set(reject)
+        self.unreachable = unreachable
+        self.written = []
+
+    def __call__(self, rows):
+        if self.unreachable:
+            raise OperationalError("Can't connect to MySQL server")
+        if any(row[1] in self.reject for row in rows):
+            raise DatabaseError("Incorrect string value")
+        self.written.extend(row[1] for row in rows)
+        return len(self.written)
+
+
+@pytest.fixture
+def log_manager(monkeypatch):
+    """A DatabaseManager whose background flush timer never fires in a test"""
+    monkeypatch.setattr(manager_module, "LOG_FLUSH_INTERVAL", 3600)
+    manager = DatabaseManager()
+    yield manager
+    manager.disconnect()
+
+
+def test_rejected_row_does_not_block_the_queue(log_manager):
+    """A row the database rejects is isolated, retried, then dropped"""
+    writer = log_manager._write_post_logs = FakeWriter(reject={"bad"})
+    for content in ("first", "bad", "last"):
+        log_manager.queue_post_log("RANDOM", content, status="failed")
+
+    assert log_manager.flush_post_logs() == 2
+    assert writer.written == ["first", "last"]
+
+    for _ in range(manager_module.LOG_MAX_ATTEMPTS - 1):
+        with pytest.raises(DatabaseError):
+            log_manager.flush_post_logs()
+    assert log_manager.flush_post_logs() is None  # Dropped for good
+
+    log_manager.queue_post_log("RANDOM", "next", status="failed")
+    log_manager.flush_post_logs()
+    assert writer.written == ["first", "last", "next"]
+
+
+def test_rows_are_kept_while_database_is_unreachable(log_manager):
+    """Connection errors re-queue every row, in order, without counting tries"""
+    writer = log_manager._write_post_logs = FakeWriter(unreachable=True)
+    log_manager.queue_post_log("RANDOM", "first", status="failed")
+    log_manager.queue_post_log("RANDOM", "second", status="failed")
+
+    for _ in range(manager_module.LOG_MAX_ATTEMPTS + 1):
+        with pytest.raises(OperationalError):
+            log_manager.flush_post_logs()
+
+    writer.unreachable = False
+    log_manager.flush_post_logs()
+    assert writer.written == ["first", "second"]
+
+
+def test_log_buffer_is_capped(log_manager, monkeypatch):
+    """The oldest rows are dropped once LOG_BUFFER_MAX are queued"""
+    monkeypatch.setattr(manager_module, "LOG_BUFFER_MAX", 2)
+    writer = log_manager._write_post_logs = FakeWriter()
+    for content in ("first", "second", "third"):
+        log_manager.queue_post_log("RANDOM", content, status="failed")
+
+    log_manager.flush_post_logs()
+    assert writer.written == ["second", "third"]
+
+
+def test_queued_rows_are_flushed_by_timer(log_manager, monkeypatch):
+    """Queued rows are written in the background without an explicit flush"""
+    monkeypatch.setattr(manager_module, "LOG_FLUSH_INTERVAL", 0.05)
+    writer = log_manager._write_post_logs = FakeWriter()
+    log_manager.queue_post_log("RANDOM", "queued", status="failed")
+
+    deadline = time.monotonic() + 2
+    while not writer.written and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert writer.written == ["queued"]
@@ -0,0 +1,116 @@
+"""
+Tests for ContentFetcher source selection
+
+_fetch_from_api is replaced with a recorder, so no content API is contacted.
+"""
+
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+# Add the parent directory to the path to import the autopost package
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from autopost.config.settings import Config
+from autopost.content import fetcher as fetcher_module
+from autopost.content.fetcher import ContentFetcher, FetchResult
+
+SOURCES = Config.ContentAPI.SOURCES
+
+
+class FakeFetch:
+    """Stands in for ContentFetcher._fetch_from_api, recording started sources"""
+
+    def __init__(self, results):
+        self.results = results  # source name -> callable returning a result
+        self.started = []
+        self.lock = threading.Lock()
+
+    def __call__(self, api):
+        with self.lock:
+            self.started.append(api.name)
+        return self.results.get(api.name, lambda: None)()
+
+
+def _result(api):
+    return lambda: FetchResult(f"from {api.name}", None, api.name, api.url)
+
+
+@pytest.fixture
+def fetcher(monkeypatch):
+    """A ContentFetcher that tries the sources in configuration order"""
+    monkeypatch.setattr(fetcher_module.random, "sample", lambda seq, k: list(seq))
+    return ContentFetcher()
+
+
+@pytest.fixture
+def hang():
+    """A fetch that blocks until the test is over, like a stalled read"""
+    release = threading.Event()
+    yield lambda: release.wait(10)
+    release.set()
+
+
+def test_only_hedged_sources_are_requested(fetcher, hang):
+    """A successful source leaves the sources past the hedge unrequested"""
+    fake = fetcher._fetch_from_api = FakeFetch(
+        {SOURCES[0].name: _result(SOURCES[0]), SOURCES[1].name: hang}
+    )
+
+    assert fetcher.fetch_content().api_name == SOURCES[0].name
+    assert set(fake.started) <= {api.name for api in SOURCES[:2]}
+
+
+def test_failed_sources_start_the_next_one(fetcher):
+    """Each failure starts one more source, keeping the hedge full"""
+    fake = fetcher._fetch_from_api = FakeFetch({SOURCES[2].name: _result(SOURCES[2])})
+
+    assert fetcher.fetch_content().api_name == SOURCES[2].name
+    assert {api.name for api in SOURCES[:3]} <= set(fake.started)
+
+
+def test_hung_sources_do_not_delay_a_later_answer(fetcher, monkeypatch, hang):
+    """A hedged source's answer is used while the first ones are still stalled"""
+    monkeypatch.setattr(fetcher_module, "FETCH_HEDGE_DELAY", 0.05)
+    fetcher._fetch_from_api = FakeFetch(
+        {
+            SOURCES[0].name: hang,
+            SOURCES[1].name: hang,
+            SOURCES[2].name: _result(SOURCES[2]),
+        }
+    )
+
+    started = time.monotonic()
+    assert fetcher.fetch_content().api_name == SOURCES[2].name
+    assert time.monotonic() - started < 1
+
+
+def test_fallback_when_every_source_fails(fetcher):
+    """Every source is tried before falling back to built-in content"""
+    fake = fetcher._fetch_from_api = FakeFetch({})
+
+    assert fetcher.fetch_content().api_name == "Fallback Content"
+    assert sorted(fake.started) == sorted(api.name for api in SOURCES)
+
+
+def test_joke_content_includes_punchline(fetcher):
+    """The Joke API source is bound to a cleaner that appends the punchline"""
+    joke_api = next(api for api in SOURCES if api.name == "Joke API")
+    data = {
+        "setup": "Why did the chicken cross the road?",
+        "punchline": " To get to the other side. ",
+    }
+
+    content = fetcher._clean_content(data["setup"], joke_api, data)
+
+    assert content == "Why did the chicken cross the road? To get to the other side."
+
+
+def test_leading_whitespace_does_not_count_against_raw_cap(fetcher):
+    """Content is stripped before it is capped at MAX_RAW_CONTENT"""
+    padded = " " * fetcher_module.MAX_RAW_CONTENT + "Stay curious."
+
+    assert fetcher._clean_content(padded, SOURCES[0]) == "Stay curious."
@@ -1,58 +1,76 @@
-#!/usr/bin/env python3
 """
-Test script for Notification Feature of Automated Daily Poster Bot
+Tests for the Notification Feature of Automated Daily Poster Bot
 Tests the notification system with various scenarios
+
+Run with pytest; add -s to see the diagnostic output.
 """
 
 import os
+import subprocess
 import sys
-import time
-import logging
-from unittest.mock import Mock, patch
-from datetime import datetime, timedelta
+import threading
+from unittest.mock import Mock
+
+import pytest
+
+# Add the parent directory to the path to import the autopost package
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from autopost.utils import notifier
+from autopost.utils.notifier import flush_notifications, send_notification
+from autopost.services.scheduler import PostScheduler
+
+
+@pytest.fixture(scope="module")
+def scheduler():
+    """One mocked-database scheduler shared by the module's tests"""
+    mock_db = Mock()
+    mock_db.get_posts_today_grouped.return_value = {"TOTAL": 0}
+    return PostScheduler(mock_db)
 
-# Add current directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from notifier import send_notification
-from scheduler import PostScheduler
-from database import DatabaseManager
+@pytest.fixture
+def backend(monkeypatch):
+    """Record deliveries instead of showing them; dedup history starts empty"""
+    flush_notifications()  # Nothing queued earlier reaches this mock
+    mock_backend = Mock(return_value=True)
+    monkeypatch.setattr(notifier, "_BACKEND", mock_backend)
+    with notifier._recent_lock:
+        notifier._recent.clear()
+    return mock_backend
 
 
-def test_basic_notification():
+def test_basic_notification(backend):
     """Test basic notification functionality"""
     print("🧪 Testing Basic Notification...")
 
-    try:
-        # Test with simple notification
-        send_notification(
-            title="Test Notification",
-            message="This is a test notification from the bot",
-        )
-        print("✅ Basic notification sent successfully")
-        return True
-    except Exception as e:
-        print(f"❌ Basic notification failed: {e}")
-        return False
-
-
-def test_notification_with_special_characters():
+    assert send_notification(
+        title="Test Notification",
+        message="This is a test notification from the bot",
+    )
+    flush_notifications()
+
+    backend.assert_called_once_with(
+        "Test Notification", "This is a test notification from the bot", 10
+    )
+    print("✅ Basic notification sent successfully")
+
+
+def test_notification_with_special_characters(backend):
     """Test notification with special characters and emojis"""
     print("🧪 Testing Notification with Special Characters...")
 
-    try:
-        send_notification(
-            title="🚀 Bot Test",
-            message="Testing with emojis: 🎉 📝 ✅\nAnd special chars: @#$%^&*()",
-        )
-        print("✅ Special characters notification sent successfully")
-        return True
-    except Exception as e:
-        print(f"❌ Special characters notification failed: {e}")
-        return False
-
-
-def test_long_message_notification():
+    title = "🚀 Bot Test"
+    message = "Testing with emojis: 🎉 📝 ✅\nAnd special chars: @#$%^&*()"
+
+    assert send_notification(title=title, message=message)
+    flush_notifications()
+
+    backend.assert_called_once_with(title, message, 10)
+    print("✅ Special characters notification sent successfully")
+
+
+def test_long_message_notification(backend):
     """Test notification with long message"""
     print("🧪 Testing Long Message Notification...")
 
@@ -61,17 +79,15 @@ def test_long_message_notification():
         * 3
     )
 
-    try:
-        send_notification(title="Long Message Test", message=long_message)
-        print("✅ Long message notification sent successfully")
-        return True
-    except Exception as e:
-        print(f"❌ Long message notification failed: {e}")
-        return False
+    assert send_notification(title="Long Message Test", message=long_message)
+    flush_notifications()
+
+    backend.assert_called_once_with("Long Message Test", long_message, 10)
+    print("✅ Long message notification sent successfully")
 
 
-def test_multiple_notifications():
-    """Test sending multiple notifications in sequence"""
+def test_multiple_notifications(backend):
+    """Notifications sent in quick succession are merged into one alert"""
     print("🧪 Testing Multiple Notifications...")
 
     notifications = [
@@ -80,209 +96,157 @@ def test_multiple_notifications():
         ("Third Test", "This is the third notification"),
     ]
 
-    success_count = 0
-    for title, message in notifications:
-        try:
-            send_notification(title=title, message=message)
-            success_count += 1
-            time.sleep(1)  # Small delay between notifications
-        except Exception as e:
-            print(f"❌ Failed to send notification '{title}': {e}")
+    sent = [
+        send_notification(title=title, message=message)
+        for title, message in notifications
+    ]
+
+    # Queued notifications are delivered together in the background
+    flush_notifications()
 
-    print(f"✅ Successfully sent {success_count}/{len(notifications)} notifications")
-    return success_count == len(notifications)
+    assert all(sent)
+    backend.assert_called_once()
+    title, message, timeout = backend.call_args.args
+    assert title == "First Test (+2 more)"
+    assert message == "\n\n".join(f"{t}\n{m}" for t, m in notifications)
+    print(f"✅ Successfully sent {len(sent)}/{len(notifications)} notifications")
 
 
-def test_scheduler_notifications():
-    """Test notifications from scheduler component"""
-    print("🧪 Testing Scheduler Notifications...")
+def test_duplicate_notifications_are_sent_once(backend):
+    """The same title and message within the dedup window is delivered once"""
+    assert send_notification("Duplicate", "Same message")
+    assert send_notification("Duplicate", "Same message")
+    flush_notifications()
 
-    # Mock database manager
-    mock_db = Mock()
-    mock_db.get_today_posts_count.return_value = 0
+    backend.assert_called_once_with("Duplicate", "Same message", 10)
 
-    scheduler = PostScheduler(mock_db)
 
-    # Test notification scheduling
-    with patch("notifier.send_notification") as mock_notify:
-        # Test daily post notification
-        scheduler.schedule_daily_post(lambda post_type: None)
+def test_full_queue_drops_notification(monkeypatch):
+    """send_notification reports False once QUEUE_MAX notifications are waiting"""
+    forwarder = notifier._BatchForwarder()
+    forwarder._thread = Mock()  # No worker, so nothing is taken off the queue
+    monkeypatch.setattr(notifier, "_forwarder", forwarder)
 
-        # Test random post notification
-        scheduler.schedule_remaining_posts(lambda post_type: None)
+    for i in range(notifier.QUEUE_MAX):
+        assert send_notification("Queued", str(i), dedup=False)
 
-        # Check if notifications were scheduled
-        jobs = scheduler.get_scheduled_jobs()
-        notification_jobs = [
-            job_info for job_info, job_func in jobs if "notify" in job_info
-        ]
+    assert not send_notification("Queued", "one too many", dedup=False)
 
-        print(f"✅ Found {len(notification_jobs)} notification jobs scheduled")
-        return len(notification_jobs) > 0
 
+def test_scheduler_notifications(scheduler, backend):
+    """Scheduling and running posts notifies nothing by itself"""
+    print("🧪 Testing Scheduler Notifications...")
+
+    # The scheduler has no notifier of its own; the bot's post callback
+    # notifies, so anything reaching the backend came from the scheduler
+    scheduler.setup_daily_schedule(lambda post_type: True)
+    info = scheduler.get_schedule_info()
+    scheduler._execute_scheduled_post("RANDOM", lambda post_type: True)
+    flush_notifications()
+
+    assert info["total_jobs"] > 0
+    backend.assert_not_called()
+    print(f"✅ Found {info['total_jobs']} post jobs scheduled")
 
-def test_notification_error_handling():
+
+def test_notification_error_handling(backend):
     """Test notification error handling"""
     print("🧪 Testing Notification Error Handling...")
 
-    # Test with None values - should raise an exception
-    try:
-        send_notification(title=None, message=None)
-        print("❌ Notification should have failed with None values")
-        return False
-    except Exception as e:
-        print(f"✅ Notification correctly rejected None values: {e}")
+    # Delivery failures are logged by the notifier, never raised to the caller
+    backend.side_effect = OSError("notification daemon gone")
+    assert send_notification(title="Failing", message="Backend raises")
+    flush_notifications()
+    assert not notifier.send_notification_sync("Failing", "Backend raises")
+    print("✅ Backend errors are reported, not raised")
 
-    # Test with empty strings - should work
-    try:
-        send_notification(title="", message="")
-        print("✅ Notification handles empty strings gracefully")
-    except Exception as e:
-        print(f"❌ Notification failed with empty strings: {e}")
-        return False
+    backend.side_effect = None
+    send_notification(title=None, message=None)
+    print("✅ Notification handles None values without raising")
 
-    # Test with very long title - should work
-    try:
-        send_notification(title="A" * 1000, message="Test message")
-        print("✅ Notification handles very long title gracefully")
-    except Exception as e:
-        print(f"❌ Notification failed with very long title: {e}")
-        return False
+    assert send_notification(title="", message="")
+    print("✅ Notification handles empty strings gracefully")
+
+    assert send_notification(title="A" * 1000, message="Test message")
+    print("✅ Notification handles very long title gracefully")
 
-    return True
+    flush_notifications()
 
 
-def test_notification_timeout():
-    """Test notification timeout behavior"""
+def test_notification_timeout(backend):
+    """The display timeout is passed through to the backend"""
     print("🧪 Testing Notification Timeout...")
 
-    try:
-        # Send notification and check if it appears
-        send_notification(
-            title="Timeout Test",
-            message="This notification should disappear after 10 seconds",
-        )
-        print("✅ Notification timeout test initiated")
-        print("   (Check if notification appears and disappears after 10 seconds)")
-        return True
-    except Exception as e:
-        print(f"❌ Timeout test failed: {e}")
-        return False
+    assert send_notification(
+        title="Timeout Test",
+        message="This notification should disappear after 5 seconds",
+        timeout=5,
+    )
+    flush_notifications()
+
+    backend.assert_called_once_with(
+        "Timeout Test", "This notification should disappear after 5 seconds", 5
+    )
+    print("✅ Notification timeout passed to the backend")
 
 
 def test_plyer_availability():
     """Test if plyer is properly installed and available"""
     print("🧪 Testing Plyer Availability...")
 
-    try:
-        import plyer
-
-        print("✅ Plyer is available")
+    pytest.importorskip("plyer", reason="Install with: pip install plyer")
+    print("✅ Plyer is available")
 
-        # Test if notification module is available
-        from plyer import notification
+    # Test if notification module is available
+    from plyer import notification
 
-        print("✅ Plyer notification module is available")
-        return True
-    except ImportError as e:
-        print(f"❌ Plyer not available: {e}")
-        print("   Install with: pip install plyer")
-        return False
+    print("✅ Plyer notification module is available")
 
 
-def test_notification_integration():
-    """Test notification integration with the main bot components"""
+def test_notification_integration(backend):
+    """The bot's post and error notifications reach the backend"""
     print("🧪 Testing Notification Integration...")
 
-    # Mock the poster bot callback
-    def mock_post_callback(post_type):
-        send_notification(
-            title="Post Result",
-            message=f"{post_type} post was successful.\nNext post scheduled: 14:00",
-        )
+    assert notifier.send_post_notification("RANDOM", True, "Posted content")
+    flush_notifications()
+    backend.assert_called_once_with(
+        "✅ RANDOM Post Successful",
+        "Successfully posted random content\n\nContent: Posted content",
+        10,
+    )
+    print("✅ Post callback notification works")
 
-    try:
-        # Test successful post notification
-        mock_post_callback("RANDOM")
-        print("✅ Post callback notification works")
-
-        # Test failed post notification
-        send_notification(
-            title="Post Result",
-            message="RANDOM post failed.\nNext post scheduled: 14:00",
-        )
-        print("✅ Failed post notification works")
-
-        return True
-    except Exception as e:
-        print(f"❌ Integration test failed: {e}")
-        return False
-
-
-def main():
-    """Run all notification tests"""
-    print("🚀 Starting Notification Feature Tests...\n")
-
-    # Disable logging for tests
-    logging.disable(logging.CRITICAL)
-
-    tests = [
-        ("Plyer Availability", test_plyer_availability),
-        ("Basic Notification", test_basic_notification),
-        ("Special Characters", test_notification_with_special_characters),
-        ("Long Message", test_long_message_notification),
-        ("Multiple Notifications", test_multiple_notifications),
-        ("Error Handling", test_notification_error_handling),
-        ("Timeout Behavior", test_notification_timeout),
-        ("Scheduler Integration", test_scheduler_notifications),
-        ("Bot Integration", test_notification_integration),
-    ]
+    backend.reset_mock()
+    assert notifier.send_error_notification("Connection refused", "RANDOM Post Error")
+    # Errors skip the queue, so no flush is needed
+    backend.assert_called_once_with(
+        "⚠️ RANDOM Post Error", "An error occurred:\nConnection refused", 15
+    )
+    print("✅ Failed post notification works")
 
-    passed = 0
-    total = len(tests)
-
-    for test_name, test_func in tests:
-        print(f"\n{'='*50}")
-        print(f"Running: {test_name}")
-        print(f"{'='*50}")
-
-        try:
-            if test_func():
-                passed += 1
-                print(f"✅ {test_name} PASSED")
-            else:
-                print(f"❌ {test_name} FAILED")
-        except Exception as e:
-            print(f"❌ {test_name} FAILED with exception: {e}")
-
-    print(f"\n{'='*50}")
-    print(f"TEST SUMMARY: {passed}/{total} tests passed")
-    print(f"{'='*50}")
-
-    if passed == total:
-        print(
-            "🎉 All notification tests passed! The notification system is working correctly."
-        )
-        print("\n📝 Notification system features:")
-        print("✅ Desktop notifications for post results")
-        print("✅ Upcoming post reminders")
-        print("✅ Error notifications")
-        print("✅ Timeout handling (10 seconds)")
-        print("✅ Special character support")
-        print("✅ Integration with scheduler")
-    else:
-        print(
-            f"⚠️  {total - passed} test(s) failed. Please check the notification system."
-        )
-        print("\n🔧 Troubleshooting tips:")
-        print("1. Ensure plyer is installed: pip install plyer")
-        print("2. Check if your desktop environment supports notifications")
-        print("3. Verify notification permissions in your OS")
-        print("4. Test with a simple notification manually")
-
-    return passed == total
-
-
-if __name__ == "__main__":
-    success = main()
-    sys.exit(0 if success else 1)
+
+def test_unresponsive_windows_host_times_out(monkeypatch):
+    """A PowerShell host that never confirms is killed instead of waited on"""
+    popen = subprocess.Popen
+    silent_host = [sys.executable, "-c", "import sys\nfor _ in sys.stdin: pass"]
+    monkeypatch.setattr(
+        notifier.subprocess, "Popen", lambda args, **kwargs: popen(silent_host, **kwargs)
+    )
+    monkeypatch.setattr(notifier, "PS_REPLY_TIMEOUT", 0.5)
+
+    assert not notifier._send_windows_notification("Title", "Message", 1)
+    assert notifier._ps_proc is None
+
+
+def test_flush_gives_up_on_a_stuck_backend(monkeypatch):
+    """A delivery that never returns cannot hold flush() past its timeout"""
+    forwarder = notifier._BatchForwarder()
+    monkeypatch.setattr(notifier, "_forwarder", forwarder)
+    release = threading.Event()
+    monkeypatch.setattr(notifier, "_BACKEND", lambda *args: release.wait(10))
+    try:
+        assert send_notification("Stuck", "Never delivered", dedup=False)
+        assert not flush_notifications(timeout=0.2)
+    finally:
+        release.set()
+    assert flush_notifications(timeout=2)
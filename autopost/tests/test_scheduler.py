@@ -0,0 +1,136 @@
+"""
+Tests for PostScheduler's job heap and scheduler loop
+
+The database is a Mock, and due times are injected into the job heap or
+through _next_run so no test waits for the wall clock.
+"""
+
+import os
+import sys
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+# Add the parent directory to the path to import the autopost package
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from autopost.services import scheduler as scheduler_module
+from autopost.services.scheduler import PostScheduler
+
+
+@pytest.fixture
+def scheduler():
+    """A PostScheduler over a database that reports no posts today"""
+    database = Mock()
+    database.get_posts_today_grouped.return_value = {"TOTAL": 0}
+    scheduler = PostScheduler(database)
+    yield scheduler
+    scheduler.stop()
+
+
+def _pop_all(scheduler):
+    """Pop every queued job, as if each one's next run had already passed"""
+    with scheduler._cv:
+        # A uniform shift keeps the heap ordered; the re-queued runs are real
+        scheduler._job_heap[:] = [
+            (next_run - 2 * 86400, job_id) for next_run, job_id in scheduler._job_heap
+        ]
+    return scheduler._pop_due_jobs()
+
+
+def test_jobs_are_popped_earliest_first(scheduler, monkeypatch):
+    """Due jobs come off the heap in order of their next run"""
+    run_at = {"09:00": 900.0, "07:00": 700.0, "08:00": 800.0}
+    monkeypatch.setattr(PostScheduler, "_next_run", staticmethod(run_at.get))
+    for at_time in run_at:
+        scheduler.add_custom_job(Mock(), at_time)
+    monkeypatch.undo()
+
+    due = scheduler._pop_due_jobs()
+
+    assert [job.at_time for job in due] == ["07:00", "08:00", "09:00"]
+
+
+def test_removed_jobs_are_not_run(scheduler):
+    """remove_job drops every job at that time; their heap entries are skipped"""
+    scheduler.add_custom_job(Mock(), "10:00")
+    scheduler.add_custom_job(Mock(), "10:00")
+    scheduler.add_custom_job(Mock(), "11:00")
+
+    assert scheduler.remove_job("10:00")
+    assert not scheduler.remove_job("10:00")
+
+    assert [job.at_time for job in _pop_all(scheduler)] == ["11:00"]
+    assert [job_id for _, job_id in scheduler._job_heap] == list(scheduler.jobs)
+
+
+def test_popped_jobs_are_rescheduled(scheduler):
+    """A job that ran is queued again for its next daily run"""
+    job_id = scheduler._add_job("CUSTOM job", "10:00", "CUSTOM", Mock())
+
+    assert [job.job_id for job in _pop_all(scheduler)] == [job_id]
+
+    assert scheduler._job_heap == [(PostScheduler._next_run("10:00"), job_id)]
+    assert scheduler._pop_due_jobs() == []
+
+
+def test_job_added_during_long_wait_runs(scheduler, monkeypatch):
+    """Adding a due job wakes a scheduler parked on an empty schedule"""
+    runs = iter([time.time()])  # Due now once, then tomorrow
+    monkeypatch.setattr(
+        PostScheduler,
+        "_next_run",
+        staticmethod(lambda at_time: next(runs, time.time() + 86400)),
+    )
+    ran = threading.Event()
+    scheduler.start()
+    time.sleep(0.1)  # Let the loop park for MAX_IDLE_WAIT
+
+    scheduler.add_custom_job(lambda post_type: ran.set(), "10:00")
+
+    assert ran.wait(2)
+
+
+def test_stop_wakes_scheduler(scheduler):
+    """stop() returns without waiting out the idle wait"""
+    scheduler.start()
+    time.sleep(0.1)
+
+    started = time.monotonic()
+    scheduler.stop()
+
+    assert time.monotonic() - started < 2
+    assert not scheduler.scheduler_thread.is_alive()
+
+
+@pytest.fixture
+def stamp(tmp_path, monkeypatch):
+    """Point the outside-post stamp file at a temporary path"""
+    path = tmp_path / "posts_stamp"
+    monkeypatch.setattr(scheduler_module, "POST_COUNTS_STAMP", path)
+    return path
+
+
+def test_limit_checks_use_in_process_counts(scheduler, stamp):
+    """Counts are loaded once and then kept up to date without the database"""
+    grouped = scheduler.database_manager.get_posts_today_grouped
+
+    assert scheduler._should_make_post("SCHEDULED")
+    scheduler._execute_scheduled_post("SCHEDULED", lambda post_type: True)
+    assert not scheduler._should_make_post("SCHEDULED")
+
+    grouped.assert_called_once_with(successful_only=True)
+
+
+def test_outside_posts_reload_counts(scheduler, stamp):
+    """A post made by another process is picked up before the next check"""
+    grouped = scheduler.database_manager.get_posts_today_grouped
+    assert scheduler._should_make_post("SCHEDULED")
+
+    grouped.return_value = {"SCHEDULED": 1, "TOTAL": 1}
+    scheduler_module.mark_post_counts_stale()
+
+    assert not scheduler._should_make_post("SCHEDULED")
+    assert grouped.call_count == 2
@@ -3,14 +3,27 @@
 Simple status checker that bypasses API connection requirement
 """
 
-import sys
-import os
 from datetime import datetime
 
-# Add current directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from ..database.manager import (
+    DatabaseManager,
+    SQL_GET_LAST_POST,
+    SQL_GET_POSTS_TODAY_GROUPED,
+)
 
-from database import DatabaseManager
+RECENT_POSTS_LIMIT = 5
+
+SQL_RECENT_POSTS = """
+    SELECT post_type, status, api_source, created_at, LEFT(content, 50)
+    FROM posts
+    ORDER BY created_at DESC
+    LIMIT %s
+"""
+
+# Everything the status screen shows, fetched in one round trip
+SQL_STATUS_OVERVIEW = ";".join(
+    (SQL_GET_POSTS_TODAY_GROUPED, SQL_GET_LAST_POST, SQL_RECENT_POSTS)
+)
 
 
 def main():
@@ -22,53 +35,45 @@ def main():
     if db_manager.connect():
         print("✅ Database connection successful")
 
-        # Get today's post count
-        total_posts = db_manager.get_today_posts_count()
-        random_posts = db_manager.get_today_posts_count("RANDOM")
-        test_posts = db_manager.get_today_posts_count("TEST")
-        scheduled_posts = db_manager.get_today_posts_count("SCHEDULED")
+        try:
+            with db_manager.get_cursor(dictionary=False) as cursor:
+                counts_rows, last_post_rows, posts = [
+                    result.fetchall()
+                    for result in cursor.execute(
+                        SQL_STATUS_OVERVIEW, (RECENT_POSTS_LIMIT,), multi=True
+                    )
+                ]
+        except Exception as e:
+            print(f"❌ Error fetching status: {e}")
+            return
+
+        # Today's post counts by type
+        counts = dict(counts_rows)
 
         print(f"📊 Today's Posts:")
-        print(f"   Total: {total_posts}")
-        print(f"   Random: {random_posts}")
-        print(f"   Test: {test_posts}")
-        print(f"   Scheduled: {scheduled_posts}")
+        print(f"   Total: {sum(counts.values())}")
+        print(f"   Random: {counts.get('RANDOM', 0)}")
+        print(f"   Test: {counts.get('TEST', 0)}")
+        print(f"   Scheduled: {counts.get('SCHEDULED', 0)}")
 
-        # Get last post time
-        last_post = db_manager.get_last_post_time()
+        # Last post time
+        last_post = last_post_rows[0][0] if last_post_rows else None
         if last_post:
             print(f"🕐 Last Post: {last_post}")
         else:
             print("🕐 Last Post: None")
 
-        # Get recent posts
+        # Recent posts
         print(f"\n📝 Recent Posts:")
-        try:
-            cursor = db_manager.connection.cursor(dictionary=True)
-            cursor.execute(
-                """
-                SELECT post_type, status, api_used, created_at, 
-                       LEFT(content, 50) as content_preview
-                FROM posts 
-                ORDER BY created_at DESC 
-                LIMIT 5
-            """
-            )
-
-            posts = cursor.fetchall()
-            if posts:
-                for post in posts:
-                    status_emoji = "✅" if post["status"] == "SUCCESS" else "❌"
-                    print(f"   {status_emoji} {post['post_type']} - {post['api_used']}")
-                    print(f"      {post['content_preview']}...")
-                    print(f"      {post['created_at']}")
-                    print()
-            else:
-                print("   No posts found")
-
-            cursor.close()
-        except Exception as e:
-            print(f"   Error fetching posts: {e}")
+        if posts:
+            for post_type, status, api_source, created_at, preview in posts:
+                status_emoji = "✅" if status == "success" else "❌"
+                print(f"   {status_emoji} {post_type} - {api_source}")
+                print(f"      {preview}...")
+                print(f"      {created_at}")
+                print()
+        else:
+            print("   No posts found")
 
     else:
         print("❌ Database connection failed")
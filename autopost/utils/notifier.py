@@ -4,10 +4,17 @@ Notification utilities for the Automated Daily Poster Bot.
 This module handles system notifications and alerts for bot events.
 """
 
+import atexit
+import itertools
 import logging
+import queue
 import subprocess
-import platform
-from typing import Optional, Dict, Any
+import sys
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional, Callable, Dict, Any, List, Tuple
 
 try:
     from plyer import notification
@@ -16,10 +23,171 @@ try:
 except ImportError:
     PLYER_AVAILABLE = False
 
+try:
+    from jeepney import DBusAddress, new_method_call
+    from jeepney.io.blocking import open_dbus_connection
+    from jeepney.wrappers import unwrap_msg
+
+    _NOTIFICATIONS_ADDRESS = DBusAddress(
+        "/org/freedesktop/Notifications",
+        bus_name="org.freedesktop.Notifications",
+        interface="org.freedesktop.Notifications",
+    )
+    JEEPNEY_AVAILABLE = True
+except ImportError:
+    JEEPNEY_AVAILABLE = False
+
+# Queued notifications are coalesced into one delivery of at most BATCH_MAX
+# items, waiting up to BATCH_MS after the first one for more to arrive
+BATCH_MAX = 16
+BATCH_MS = 200
+
+# Notifications waiting beyond this are dropped rather than piling up behind
+# a stalled notification daemon
+QUEUE_MAX = 64
+
+# Longest process exit waits for queued notifications (plyer has no timeout)
+SHUTDOWN_FLUSH_TIMEOUT = 5.0
+
+
+class _BatchForwarder:
+    """Background worker that coalesces queued notifications into one delivery"""
+
+    def __init__(self):
+        self._queue = queue.Queue(maxsize=QUEUE_MAX)
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, title: str, message: str, timeout: int) -> bool:
+        """Queue a notification, starting the worker thread on first use
+
+        Returns False (and drops the notification) if the queue is full.
+        """
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name="notifier", daemon=True
+                    )
+                    self._thread.start()
+        try:
+            self._queue.put_nowait((title, message, timeout))
+        except queue.Full:
+            logging.getLogger(__name__).warning(f"Notification queue full: {title}")
+            return False
+        return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every queued notification has been delivered
+
+        Gives up after ``timeout`` seconds if one is given; returns False if
+        notifications were still pending then.
+        """
+        if self._thread is None:
+            return True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        done = self._queue.all_tasks_done
+        with done:
+            while self._queue.unfinished_tasks:
+                if deadline is None:
+                    done.wait()
+                    continue
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                done.wait(remaining)
+        return True
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            try:
+                while len(batch) < BATCH_MAX:
+                    batch.append(self._queue.get(timeout=BATCH_MS / 1000))
+            except queue.Empty:
+                pass
+
+            try:
+                _deliver_batch(batch)
+            except Exception as e:
+                logging.getLogger(__name__).error(f"Failed to send notifications: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+
+_forwarder = _BatchForwarder()
+
+# Identical (title, message) pairs within _DEDUP_TTL seconds are sent once
+_DEDUP_TTL = 30.0
+_DEDUP_MAX = 512
+_recent: "OrderedDict[Tuple[str, str], float]" = OrderedDict()
+_recent_lock = threading.Lock()
+
+
+def _is_duplicate(title: str, message: str) -> bool:
+    """Record this notification; True if the same one was sent recently"""
+    key = (title, message)
+    now = time.monotonic()
+    with _recent_lock:
+        # Entries are in send order, so expired ones are at the front
+        while _recent and next(iter(_recent.values())) < now - _DEDUP_TTL:
+            _recent.popitem(last=False)
+        if key in _recent:
+            return True
+        _recent[key] = now
+        if len(_recent) > _DEDUP_MAX:
+            _recent.popitem(last=False)
+    return False
+
 
-def send_notification(title: str, message: str, timeout: int = 10) -> bool:
+def _deliver_batch(batch: List[Tuple[str, str, int]]) -> bool:
+    """Deliver queued notifications, merging several into one multi-line alert"""
+    if len(batch) == 1:
+        return send_notification_sync(*batch[0])
+
+    title = f"{batch[0][0]} (+{len(batch) - 1} more)"
+    message = "\n\n".join(f"{t}\n{m}" for t, m, _ in batch)
+    timeout = max(t for _, _, t in batch)
+    return send_notification_sync(title, message, timeout)
+
+
+def send_notification(
+    title: str, message: str, timeout: int = 10, dedup: bool = True
+) -> bool:
     """
-    Send a system notification
+    Queue a system notification for background delivery
+
+    Notifications sent in quick succession are delivered together as one
+    alert. Use send_notification_sync() when it must be shown right away.
+
+    Args:
+        title: Notification title
+        message: Notification message
+        timeout: Timeout in seconds
+        dedup: Skip it if the same title and message were sent in the last 30s
+
+    Returns:
+        bool: True if the notification was queued (or was a duplicate),
+            False if the queue was full
+    """
+    if dedup and _is_duplicate(title, message):
+        return True
+
+    return _forwarder.submit(title, message, timeout)
+
+
+def flush_notifications(timeout: Optional[float] = None) -> bool:
+    """Block until all queued notifications have been delivered
+
+    Returns False if some were still pending after ``timeout`` seconds.
+    """
+    return _forwarder.flush(timeout)
+
+
+def send_notification_sync(title: str, message: str, timeout: int = 10) -> bool:
+    """
+    Send a system notification immediately on the calling thread
 
     Args:
         title: Notification title
@@ -29,28 +197,13 @@ def send_notification(title: str, message: str, timeout: int = 10) -> bool:
     Returns:
         bool: True if notification was sent successfully
     """
-    logger = logging.getLogger(__name__)
+    if _BACKEND is None:
+        return False  # Unsupported platform (warned once at import)
 
     try:
-        # Try plyer first (cross-platform)
-        if PLYER_AVAILABLE:
-            return _send_plyer_notification(title, message, timeout)
-
-        # Fallback to platform-specific methods
-        system = platform.system().lower()
-
-        if system == "linux":
-            return _send_linux_notification(title, message, timeout)
-        elif system == "darwin":  # macOS
-            return _send_macos_notification(title, message, timeout)
-        elif system == "windows":
-            return _send_windows_notification(title, message, timeout)
-        else:
-            logger.warning(f"Unsupported platform for notifications: {system}")
-            return False
-
+        return _BACKEND(title, message, timeout)
     except Exception as e:
-        logger.error(f"Failed to send notification: {e}")
+        logging.getLogger(__name__).error(f"Failed to send notification: {e}")
         return False
 
 
@@ -64,63 +217,272 @@ def _send_plyer_notification(title: str, message: str, timeout: int) -> bool:
         return False
 
 
+# Longest wait for notify-send/osascript to hand the notification over
+NOTIFIER_TIMEOUT = 5.0
+
+
+def _run_notifier(args: List[str]) -> bool:
+    """Run a notifier command and wait for it, so its exit status counts
+
+    Raises CalledProcessError on a non-zero exit and TimeoutExpired (after
+    killing it) if it takes longer than NOTIFIER_TIMEOUT.
+    """
+    subprocess.run(
+        args,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        timeout=NOTIFIER_TIMEOUT,
+        check=True,
+    )
+    return True
+
+
+# Session-bus connection reused for every Linux notification (jeepney only)
+_dbus_conn = None
+# Notify arguments that never change: app name, replaces_id, icon, and the
+# actions/hints after the body
+_NOTIFY_APP_ARGS = ("AutoPost Bot", 0, "")
+_NOTIFY_EXTRA_ARGS = ([], {})
+_dbus_lock = threading.Lock()
+
+
+def _send_dbus_notification(title: str, message: str, timeout: int) -> bool:
+    """Send notification on Linux by calling the freedesktop Notify method"""
+    global _dbus_conn
+    with _dbus_lock:
+        if _dbus_conn is None:
+            _dbus_conn = open_dbus_connection(bus="SESSION")
+        call = new_method_call(
+            _NOTIFICATIONS_ADDRESS,
+            "Notify",
+            "susssasa{sv}i",
+            (*_NOTIFY_APP_ARGS, title, message, *_NOTIFY_EXTRA_ARGS, timeout * 1000),
+        )
+        try:
+            unwrap_msg(_dbus_conn.send_and_get_reply(call, timeout=5))
+        except Exception:
+            _dbus_conn.close()
+            _dbus_conn = None  # Reconnect on the next notification
+            raise
+    return True
+
+
 def _send_linux_notification(title: str, message: str, timeout: int) -> bool:
-    """Send notification on Linux using notify-send"""
+    """Send notification on Linux over D-Bus, falling back to notify-send"""
+    if JEEPNEY_AVAILABLE:
+        try:
+            return _send_dbus_notification(title, message, timeout)
+        except Exception as e:
+            logging.getLogger(__name__).debug(f"D-Bus notification failed: {e}")
+
     try:
-        subprocess.run(
+        return _run_notifier(
             [
                 "notify-send",
                 "-t",
                 str(timeout * 1000),  # Convert to milliseconds
                 title,
                 message,
-            ],
-            check=True,
-            capture_output=True,
+            ]
         )
-        return True
-    except (subprocess.CalledProcessError, FileNotFoundError) as e:
+    except (subprocess.SubprocessError, OSError) as e:
         logging.getLogger(__name__).warning(f"Linux notification failed: {e}")
         return False
 
 
+# Title and message are passed as script arguments rather than interpolated,
+# so quotes and backslashes in them need no escaping
+_OSASCRIPT_NOTIFY = (
+    "osascript",
+    "-e",
+    "on run argv",
+    "-e",
+    "display notification (item 2 of argv) with title (item 1 of argv)",
+    "-e",
+    "end run",
+)
+
+
 def _send_macos_notification(title: str, message: str, timeout: int) -> bool:
     """Send notification on macOS using osascript"""
     try:
-        script = f"""
-        display notification "{message}" with title "{title}"
-        """
-        subprocess.run(["osascript", "-e", script], check=True, capture_output=True)
-        return True
-    except (subprocess.CalledProcessError, FileNotFoundError) as e:
+        return _run_notifier([*_OSASCRIPT_NOTIFY, title, message])
+    except (subprocess.SubprocessError, OSError) as e:
         logging.getLogger(__name__).warning(f"macOS notification failed: {e}")
         return False
 
 
+# Long-lived PowerShell session used for Windows notifications, so the
+# interpreter start-up and assembly load are paid once per process
+_ps_proc = None
+_ps_lines: Optional[queue.Queue] = None  # Host stdout lines; None marks EOF
+_ps_lock = threading.Lock()
+_ps_ids = itertools.count(1)
+
+# Longest wait for the host to confirm a notification (includes its start-up)
+PS_REPLY_TIMEOUT = 15.0
+
+_PS_INIT = (
+    "Add-Type -AssemblyName System.Windows.Forms; "
+    "Add-Type -AssemblyName System.Drawing; "
+    "$notifications = @{}"
+)
+
+
+def _ps_quote(text: str) -> str:
+    """Quote text as a single-line PowerShell string expression"""
+    lines = str(text).replace("\r", "").replace("'", "''").split("\n")
+    return "(" + " + [char]10 + ".join(f"'{line}'" for line in lines) + ")"
+
+
+def _read_lines(stream, lines: queue.Queue):
+    """Forward a host's stdout to a queue, so replies can be awaited with a timeout"""
+    for line in stream:
+        lines.put(line)
+    lines.put(None)
+
+
+def _powershell_host() -> Tuple[subprocess.Popen, queue.Queue]:
+    """Return the persistent PowerShell process and its output lines"""
+    global _ps_proc, _ps_lines
+    if _ps_proc is None or _ps_proc.poll() is not None:
+        _ps_proc = subprocess.Popen(
+            ["powershell", "-NoProfile", "-NonInteractive", "-Command", "-"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+        )
+        _ps_lines = queue.Queue()
+        threading.Thread(
+            target=_read_lines,
+            args=(_ps_proc.stdout, _ps_lines),
+            name="powershell-reader",
+            daemon=True,
+        ).start()
+        _ps_proc.stdin.write(_PS_INIT + "\n")
+        _ps_proc.stdin.flush()
+    return _ps_proc, _ps_lines
+
+
+def _kill_powershell_host():
+    """Kill an unresponsive host; the next notification starts a new one"""
+    global _ps_proc
+    if _ps_proc is not None:
+        _ps_proc.kill()
+        _ps_proc.wait()
+        _ps_proc = None
+
+
+def _close_powershell_host():
+    """Let the host finish its input and exit, killing it if it hangs"""
+    with _ps_lock:
+        if _ps_proc is None or _ps_proc.poll() is not None:
+            return
+        try:
+            _ps_proc.stdin.close()  # PowerShell exits at the end of its input
+            _ps_proc.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            _kill_powershell_host()
+
+
+@atexit.register
+def _shutdown():
+    """Deliver queued notifications, then release the helpers they used
+
+    One hook keeps the order: atexit runs hooks last-registered-first, so
+    separate hooks would close the host before the final flush needed it.
+    """
+    if not _forwarder.flush(SHUTDOWN_FLUSH_TIMEOUT):
+        logging.getLogger(__name__).warning(
+            "Notifications still pending at exit were dropped"
+        )
+    _close_powershell_host()
+
+
 def _send_windows_notification(title: str, message: str, timeout: int) -> bool:
-    """Send notification on Windows using PowerShell"""
-    try:
-        script = f"""
-        Add-Type -AssemblyName System.Windows.Forms
-        $notification = New-Object System.Windows.Forms.NotifyIcon
-        $notification.Icon = [System.Drawing.SystemIcons]::Information
-        $notification.BalloonTipTitle = "{title}"
-        $notification.BalloonTipText = "{message}"
-        $notification.BalloonTipIcon = [System.Windows.Forms.ToolTipIcon]::Info
-        $notification.Visible = $true
-        $notification.ShowBalloonTip({timeout * 1000})
-        Start-Sleep -Seconds {timeout + 1}
-        $notification.Dispose()
-        """
-        subprocess.run(
-            ["powershell", "-Command", script], check=True, capture_output=True
+    """Send notification on Windows through the persistent PowerShell host"""
+    job_id = next(_ps_ids)
+    done = f"__DONE__{job_id}__"
+    # One line per command: PowerShell runs stdin input line by line. Balloons
+    # are disposed by a later command once their display time has passed
+    # instead of sleeping here.
+    script = "; ".join(
+        (
+            "foreach ($k in @($notifications.Keys)) { "
+            "if ($notifications[$k].Expires -lt (Get-Date)) { "
+            "$notifications[$k].Icon.Dispose(); $notifications.Remove($k) } }",
+            "$n = New-Object System.Windows.Forms.NotifyIcon",
+            "$n.Icon = [System.Drawing.SystemIcons]::Information",
+            f"$n.BalloonTipTitle = {_ps_quote(title)}",
+            f"$n.BalloonTipText = {_ps_quote(message)}",
+            "$n.BalloonTipIcon = [System.Windows.Forms.ToolTipIcon]::Info",
+            "$n.Visible = $true",
+            f"$n.ShowBalloonTip({timeout * 1000})",
+            f"$notifications[{job_id}] = @{{ Icon = $n; "
+            f"Expires = (Get-Date).AddSeconds({timeout + 1}) }}",
+            f"Write-Output '{done}'",
         )
-        return True
-    except (subprocess.CalledProcessError, FileNotFoundError) as e:
+    )
+
+    try:
+        with _ps_lock:
+            proc, lines = _powershell_host()
+            proc.stdin.write(script + "\n")
+            proc.stdin.flush()
+
+            deadline = time.monotonic() + PS_REPLY_TIMEOUT
+            while True:
+                try:
+                    line = lines.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    _kill_powershell_host()
+                    raise OSError("PowerShell host did not answer in time")
+                if line is None:
+                    # stdout closed before the sentinel: the host died
+                    _kill_powershell_host()
+                    raise OSError("PowerShell host exited")
+                if line.strip() == done:
+                    return True
+    except (OSError, ValueError) as e:
         logging.getLogger(__name__).warning(f"Windows notification failed: {e}")
         return False
 
 
+def _pick_backend() -> Optional[Callable[[str, str, int], bool]]:
+    """Choose the notification backend for this process"""
+    # Try plyer first (cross-platform), then platform-specific methods
+    if PLYER_AVAILABLE:
+        return _send_plyer_notification
+
+    backend = {
+        "linux": _send_linux_notification,
+        "darwin": _send_macos_notification,  # macOS
+        "windows": _send_windows_notification,
+    }.get(_SYSTEM)
+    if backend is None:
+        logging.getLogger(__name__).warning(
+            f"Unsupported platform for notifications: {_SYSTEM}"
+        )
+    return backend
+
+
+# The platform can't change at runtime, so the backend is resolved once
+# (sys.platform is a constant string; platform.system() may run uname)
+if sys.platform.startswith("linux"):
+    _SYSTEM = "linux"
+elif sys.platform == "win32":
+    _SYSTEM = "windows"
+else:
+    _SYSTEM = sys.platform  # "darwin" on macOS
+_BACKEND = _pick_backend()
+
+
+_STATUS_TITLE = "🤖 AutoPost Bot Status"
+
+
 def send_bot_status_notification(status: Dict[str, Any]) -> bool:
     """
     Send a notification with bot status information
@@ -131,20 +493,18 @@ def send_bot_status_notification(status: Dict[str, Any]) -> bool:
     Returns:
         bool: True if notification was sent successfully
     """
-    title = "🤖 AutoPost Bot Status"
+    title = _STATUS_TITLE
 
     # Create status message
-    lines = []
-    lines.append(f"Running: {'✅ Yes' if status.get('is_running') else '❌ No'}")
-    lines.append(f"Posts Today: {status.get('posts_today', 0)}")
-    lines.append(f"Random Posts: {status.get('random_posts_today', 0)}")
-    lines.append(f"Scheduled Posts: {status.get('scheduled_posts_today', 0)}")
-
     last_post = status.get("last_post_time")
-    if last_post:
-        lines.append(f"Last Post: {last_post}")
-
-    message = "\n".join(lines)
+    message = "\n".join(
+        (
+            f"Running: {'✅ Yes' if status.get('is_running') else '❌ No'}",
+            f"Posts Today: {status.get('posts_today', 0)}",
+            f"Random Posts: {status.get('random_posts_today', 0)}",
+            f"Scheduled Posts: {status.get('scheduled_posts_today', 0)}",
+        )
+    ) + (f"\nLast Post: {last_post}" if last_post else "")
 
     return send_notification(title, message)
 
@@ -165,16 +525,20 @@ def send_post_notification(
     """
     if success:
         title = f"✅ {post_type} Post Successful"
-        message = f"Successfully posted {post_type.lower()} content"
+        outcome = "Successfully posted"
     else:
         title = f"❌ {post_type} Post Failed"
-        message = f"Failed to post {post_type.lower()} content"
+        outcome = "Failed to post"
 
     if content_preview:
         # Truncate content preview if too long
         if len(content_preview) > 100:
             content_preview = content_preview[:97] + "..."
-        message += f"\n\nContent: {content_preview}"
+        detail = f"\n\nContent: {content_preview}"
+    else:
+        detail = ""
+
+    message = f"{outcome} {post_type.lower()} content{detail}"
 
     return send_notification(title, message)
 
@@ -198,20 +562,28 @@ def send_error_notification(error_message: str, context: str = "Bot Error") -> b
 
     message = f"An error occurred:\n{error_message}"
 
-    return send_notification(title, message, timeout=15)
+    if _is_duplicate(title, message):
+        return True
 
+    # Errors are shown right away rather than waiting on the batch queue
+    return send_notification_sync(title, message, timeout=15)
 
+
+@lru_cache(maxsize=1)
 def is_notification_supported() -> bool:
     """
     Check if notifications are supported on the current platform
 
+    The probe result is cached for the process; call
+    is_notification_supported.cache_clear() to probe again.
+
     Returns:
         bool: True if notifications are supported
     """
     if PLYER_AVAILABLE:
         return True
 
-    system = platform.system().lower()
+    system = _SYSTEM
 
     if system == "linux":
         try: